@@ -1,47 +1,49 @@
 from .nodes import (
-    LumiGeminiImagenConfig,
-    LumiGoogleImagenProvider,
-    LumiLLMImagenProcessor,
-    LumiLLMPromptProcessor,
-    LumiNoiseToSeed,
-    LumiOpenRouterImagenProvider,
-    LumiOpenRouterProvider,
-    LumiSaveImage,
-    LumiSeed,
-    LumiShowText,
-    LumiShufflePrompt,
-    LumiTextInput,
-    LumiWildcardProcessor,
-    LumiWrapText,
+    LazyNodeMapping,
+    feedback,  # noqa: F401  (registers the /lumi/feedback route)
+    llm_metrics,  # noqa: F401  (registers the /lumi/metrics routes)
+    text_pages,  # noqa: F401  (registers the /lumi/show_text route)
+)
+from .nodes.startup_profile import (
+    startup_profile,  # also registers /lumi/startup_profile
 )
 
-NODE_CLASS_MAPPINGS = {
-    "LumiNoiseToSeed": LumiNoiseToSeed,
-    "LumiSeed": LumiSeed,
-    "LumiShowText": LumiShowText,
-    "LumiShufflePrompt": LumiShufflePrompt,
-    "LumiTextInput": LumiTextInput,
-    "LumiWildcardProcessor": LumiWildcardProcessor,
-    "LumiOpenRouterProvider": LumiOpenRouterProvider,
-    "LumiLLMPromptProcessor": LumiLLMPromptProcessor,
-    "LumiWrapText": LumiWrapText,
-    "LumiGeminiImagenConfig": LumiGeminiImagenConfig,
-    "LumiOpenRouterImagenProvider": LumiOpenRouterImagenProvider,
-    "LumiGoogleImagenProvider": LumiGoogleImagenProvider,
-    "LumiLLMImagenProcessor": LumiLLMImagenProcessor,
-    "LumiSaveImage": LumiSaveImage,
-}
+# Node classes are imported on first lookup
+NODE_CLASS_MAPPINGS = LazyNodeMapping(
+    [
+        "LumiNoiseToSeed",
+        "LumiSeed",
+        "LumiSeedSweep",
+        "LumiShowText",
+        "LumiShufflePrompt",
+        "LumiShufflePromptList",
+        "LumiTextInput",
+        "LumiWildcardProcessor",
+        "LumiOpenRouterProvider",
+        "LumiLLMPromptProcessor",
+        "LumiWrapText",
+        "LumiComposeText",
+        "LumiGeminiImagenConfig",
+        "LumiOpenRouterImagenProvider",
+        "LumiGoogleImagenProvider",
+        "LumiLLMImagenProcessor",
+        "LumiSaveImage",
+    ]
+)
 
 NODE_DISPLAY_NAME_MAPPINGS = {
     "LumiNoiseToSeed": "Lumi Noise To Seed",
     "LumiSeed": "Lumi Seed",
+    "LumiSeedSweep": "Lumi Seed Sweep",
     "LumiShowText": "Lumi Show Text",
     "LumiShufflePrompt": "Lumi Shuffle Prompt",
+    "LumiShufflePromptList": "Lumi Shuffle Prompt List",
     "LumiTextInput": "Lumi Text Input",
     "LumiWildcardProcessor": "Lumi Wildcard Processor",
     "LumiOpenRouterProvider": "Lumi OpenRouter Provider",
     "LumiLLMPromptProcessor": "Lumi LLM Prompt Processor",
     "LumiWrapText": "Lumi Wrap Text",
+    "LumiComposeText": "Lumi Compose Text",
     "LumiGeminiImagenConfig": "Lumi Gemini Imagen Config",
     "LumiOpenRouterImagenProvider": "Lumi OpenRouter Imagen Provider",
     "LumiGoogleImagenProvider": "Lumi Google Imagen Provider",
@@ -51,4 +53,7 @@ NODE_DISPLAY_NAME_MAPPINGS = {
 
 WEB_DIRECTORY = "./js"
 
+startup_profile.mark("package import")
+startup_profile.log_summary("package registered")
+
 __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS", "WEB_DIRECTORY"]
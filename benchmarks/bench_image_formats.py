@@ -0,0 +1,69 @@
+"""
+Encode time and size per output format of Lumi Save Image at 1K/2K/4K.
+
+Uses a synthetic photo-like image (smooth gradients, texture and mild noise)
+so lossless formats are neither trivially compressible nor pure noise.
+
+    python -m benchmarks.bench_image_formats --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+from PIL import Image
+
+from .common import install_folder_paths_stub, load_package, print_table
+
+SIZES = {"1K": 1024, "2K": 2048, "4K": 4096}
+
+
+def synthetic_image(size: int, seed: int = 0) -> np.ndarray:
+    """Photo-like uint8 RGB test image."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    channels = [
+        0.5 + 0.35 * np.sin(6.0 * x + 2.0 * y) + 0.1 * np.cos(40.0 * x * y),
+        0.5 + 0.30 * np.cos(5.0 * y - 3.0 * x) + 0.1 * np.sin(25.0 * (x + y) ** 2),
+        0.4 + 0.40 * x * y + 0.1 * np.sin(60.0 * x) * np.cos(45.0 * y),
+    ]
+    image = np.stack(channels, axis=-1) * 255.0
+    image += rng.normal(0.0, 4.0, image.shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lumi Save Image format benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Encodes per cell (median)")
+    parser.add_argument("--sizes", default="1K,2K,4K")
+    parser.add_argument("--quality", type=int, default=90)
+    parser.add_argument("--effort", type=int, default=4)
+    args = parser.parse_args()
+
+    install_folder_paths_stub()
+    formats = load_package().nodes.image_formats
+
+    rows = []
+    for label in args.sizes.split(","):
+        img = Image.fromarray(synthetic_image(SIZES[label]))
+        for fmt in formats.get_output_formats() + ["jpg"]:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                if fmt == "jpg":
+                    # Reference: the JPG fallback written for oversized PNGs
+                    size = len(formats.encode_jpeg(img, args.quality))
+                else:
+                    size = len(formats.encode_image(img, fmt, None, args.quality, args.effort))
+                timings.append(time.perf_counter() - start)
+            seconds = float(np.median(timings))
+            rows.append([label, fmt, f"{seconds * 1000:.0f}", f"{size / 1024:.0f}"])
+
+    print(f"\nquality={args.quality} effort={args.effort}, median of {args.repeat}\n")
+    print_table(["size", "format", "encode ms", "KiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
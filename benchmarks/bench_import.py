@@ -0,0 +1,185 @@
+"""
+Import-time benchmark for the node pack.
+
+Loads the package in a fresh interpreter with `python -X importtime` (with the
+folder_paths stub, as ComfyUI would provide it) and reports:
+
+- register: wall time to import the package and list NODE_CLASS_MAPPINGS
+- resolve: additional wall time to resolve every node class
+- importtime: summed self time of all modules imported while registering
+- heavy: which of torch/numpy/PIL/requests/dynamicprompts were loaded, with
+  their cumulative import time
+
+Inside ComfyUI, torch, numpy and PIL are already imported by the host;
+--preload imports them before measuring so only the pack's own share is
+counted. Use --compare to measure another revision side by side:
+
+    python -m benchmarks.bench_import --repeat 5 --compare HEAD~1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+
+from .common import REPO_ROOT, print_table
+
+HEAVY_MODULES = ["torch", "numpy", "PIL", "requests", "dynamicprompts"]
+
+BEGIN_MARKER = "lumi-bench-import-begin"
+END_MARKER = "lumi-bench-import-end"
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {repo!r})
+from benchmarks.common import install_folder_paths_stub, load_package
+install_folder_paths_stub()
+for name in {preload!r}:
+    __import__(name)
+heavy = {heavy!r}
+preloaded = [name for name in heavy if name in sys.modules]
+
+sys.stderr.write({begin!r} + "\\n"); sys.stderr.flush()
+start = time.perf_counter()
+package = load_package({root!r})
+names = list(package.NODE_CLASS_MAPPINGS)
+registered = time.perf_counter()
+sys.stderr.flush(); sys.stderr.write({end!r} + "\\n"); sys.stderr.flush()
+classes = dict(package.NODE_CLASS_MAPPINGS.items())
+resolved = time.perf_counter()
+
+print(json.dumps({{
+    "register": registered - start,
+    "resolve": resolved - registered,
+    "nodes": len(names),
+    "heavy": [name for name in heavy if name in sys.modules and name not in preloaded],
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> tuple[float, dict[str, float]]:
+    """
+    Sum self time (seconds) between the markers and get the import time of each heavy module.
+
+    A heavy module's time is the cumulative time of its (sub)module imports at
+    the shallowest nesting level they appear, so packages imported piecemeal
+    are fully counted.
+    """
+    total = 0.0
+    # heavy module -> (depth, seconds)
+    heavy: dict[str, tuple[int, float]] = {}
+    inside = False
+    for line in stderr.splitlines():
+        if line == BEGIN_MARKER:
+            inside = True
+            continue
+        if line == END_MARKER:
+            break
+        if not inside or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        total += int(head.split(":")[1]) / 1e6
+        # importtime indents nested imports by two spaces per level
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        root = name.split(".")[0]
+        if root not in HEAVY_MODULES:
+            continue
+        seconds = int(cumulative_us) / 1e6
+        known = heavy.get(root)
+        if known is None or depth < known[0]:
+            heavy[root] = (depth, seconds)
+        elif depth == known[0]:
+            heavy[root] = (depth, known[1] + seconds)
+    return total, {name: seconds for name, (_, seconds) in heavy.items()}
+
+
+def measure(root: str, repeat: int, preload: list[str]) -> dict:
+    runs = []
+    for _ in range(repeat):
+        code = CHILD.format(
+            repo=str(REPO_ROOT),
+            root=root,
+            heavy=HEAVY_MODULES,
+            preload=preload,
+            begin=BEGIN_MARKER,
+            end=END_MARKER,
+        )
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result["importtime"], result["heavy_times"] = parse_importtime(proc.stderr)
+        runs.append(result)
+
+    median = {key: statistics.median(run[key] for run in runs) for key in ("register", "resolve")}
+    median["importtime"] = statistics.median(run["importtime"] for run in runs)
+    median["nodes"] = runs[-1]["nodes"]
+    median["heavy"] = {
+        name: statistics.median(run["heavy_times"].get(name, 0.0) for run in runs)
+        for name in runs[-1]["heavy"]
+    }
+    return median
+
+
+def export_revision(rev: str) -> str:
+    """Extract a git revision of this repository into a temporary directory."""
+    archive = subprocess.run(
+        ["git", "-C", str(REPO_ROOT), "archive", "--format=tar", rev],
+        capture_output=True,
+        check=True,
+    ).stdout
+    target = tempfile.mkdtemp(prefix="lumi-bench-rev-")
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target, filter="data")
+    return target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lumi Tools import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per checkout")
+    parser.add_argument("--compare", help="Git revision to measure alongside the working tree")
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="Import torch, numpy and PIL first, like the ComfyUI host does",
+    )
+    args = parser.parse_args()
+    preload = ["torch", "numpy", "PIL.Image"] if args.preload else []
+
+    checkouts = [("working tree", str(REPO_ROOT))]
+    if args.compare:
+        checkouts.insert(0, (args.compare, export_revision(args.compare)))
+
+    rows = []
+    for label, root in checkouts:
+        result = measure(root, args.repeat, preload)
+        heavy = ", ".join(f"{name} {sec * 1000:.0f}ms" for name, sec in result["heavy"].items())
+        rows.append(
+            [
+                label,
+                result["nodes"],
+                f"{result['register'] * 1000:.0f}",
+                f"{result['resolve'] * 1000:.1f}",
+                f"{result['importtime'] * 1000:.0f}",
+                heavy or "-",
+            ]
+        )
+
+    print(f"\nmedian of {args.repeat} fresh interpreters, preload={args.preload}\n")
+    print_table(
+        ["checkout", "nodes", "register ms", "resolve ms", "importtime ms", "heavy modules"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
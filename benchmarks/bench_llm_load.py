@@ -0,0 +1,138 @@
+"""
+Load benchmark for the LLM and imagen HTTP paths against the local mock server.
+
+Drives LumiLLMPromptProcessor and LumiLLMImagenProcessor (Google and OpenRouter
+providers) at several concurrency levels and reports throughput and latency.
+No API keys or network access are needed.
+
+    python -m benchmarks.bench_llm_load --requests 64 --concurrency 1,4,16 --latency 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from .common import install_folder_paths_stub, load_package, percentile, print_table
+from .mock_llm_server import MockConfig, parse_size, start_server
+
+API_KEY_ENV = "LUMI_BENCH_API_KEY"
+
+INSTRUCTIONS = "You are a prompt writer. Rewrite the prompt with rich visual detail. " * 40
+
+
+def build_paths(nodes) -> dict[str, Callable[[int], object]]:
+    """Create one callable per benchmarked path, taking the seed for the call."""
+    imagen = nodes.llm_imagen_processor
+    config = imagen.LumiGeminiImagenConfig().create_config("1:1", "1K", 1.0, 1.0)[0]
+    google = imagen.LumiGoogleImagenProvider().create_provider(
+        API_KEY_ENV, "gemini-3-pro-image-preview"
+    )[0]
+    openrouter_imagen = imagen.LumiOpenRouterImagenProvider().create_provider(
+        API_KEY_ENV, "google/gemini-3-pro-image-preview"
+    )[0]
+    text_provider = nodes.openrouter_provider.LumiOpenRouterProvider().create_provider(
+        API_KEY_ENV, "mock/text-model", 256, 1.0
+    )[0]
+    processor = imagen.LumiLLMImagenProcessor()
+    prompt_processor = nodes.llm_prompt_processor.LumiLLMPromptProcessor()
+
+    return {
+        "prompt/openrouter": lambda seed: prompt_processor.process_prompt(
+            text_provider, INSTRUCTIONS, "a lighthouse at dusk", seed
+        ),
+        "imagen/google": lambda seed: processor.generate_images(
+            google, config, "a lighthouse at dusk", seed, INSTRUCTIONS
+        ),
+        "imagen/openrouter": lambda seed: processor.generate_images(
+            openrouter_imagen, config, "a lighthouse at dusk", seed, INSTRUCTIONS
+        ),
+    }
+
+
+def run_level(call: Callable[[int], object], requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+
+    def one(seed: int) -> float:
+        start = time.perf_counter()
+        call(seed)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one, seed) for seed in range(1, requests + 1)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    wall = time.perf_counter() - start
+
+    return {
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM/imagen load benchmark (mock server)")
+    parser.add_argument("--requests", type=int, default=32, help="Requests per level")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated levels")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--image-size", default="1024x1024", help="Mock image size, WxH")
+    parser.add_argument(
+        "--paths",
+        default="prompt/openrouter,imagen/google,imagen/openrouter",
+        help="Comma-separated paths to benchmark",
+    )
+    args = parser.parse_args()
+
+    width, height = parse_size(args.image_size)
+    server = start_server(MockConfig(args.latency, args.jitter, args.error_rate, width, height))
+    os.environ["LUMI_OPENROUTER_BASE_URL"] = server.openrouter_base_url
+    os.environ["LUMI_GOOGLE_BASE_URL"] = server.google_base_url
+    os.environ.setdefault(API_KEY_ENV, "mock-key")
+
+    install_folder_paths_stub()
+    package = load_package()
+    paths = build_paths(package.nodes)
+    levels = [int(level) for level in args.concurrency.split(",") if level]
+
+    rows = []
+    for name in args.paths.split(","):
+        for level in levels:
+            stats = run_level(paths[name], args.requests, level)
+            rows.append(
+                [
+                    name,
+                    level,
+                    f"{stats['throughput']:.2f}",
+                    f"{stats['p50'] * 1000:.0f}",
+                    f"{stats['p95'] * 1000:.0f}",
+                    f"{stats['p99'] * 1000:.0f}",
+                    stats["errors"],
+                ]
+            )
+
+    print(
+        f"\n{args.requests} requests per level, mock latency {args.latency}s "
+        f"(+{args.jitter}s jitter), image {width}x{height}, error rate {args.error_rate}\n"
+    )
+    print_table(
+        ["path", "concurrency", "req/s", "p50 ms", "p95 ms", "p99 ms", "errors"],
+        rows,
+    )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Throughput benchmark for LumiSaveImage.save_images.
+
+Feeds synthetic image batches of several resolutions and batch sizes through
+the node with a stubbed folder_paths and reports images/sec, MB/s written,
+peak RSS and time per image spent in each save stage (tensor conversion,
+metadata, encode, JPEG fallback, write, UI preview).
+
+Each case runs in a fresh child process so peak RSS belongs to that case alone.
+
+    python -m benchmarks.bench_save_image --sizes 1K,2K --batches 1,4,8 --formats png,webp
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from .bench_image_formats import SIZES, synthetic_image
+from .common import (
+    install_comfy_args_stub,
+    install_folder_paths_stub,
+    load_package,
+    print_table,
+)
+
+# Stages reported per image, in pipeline order
+STAGES = ["convert", "metadata", "estimate", "encode", "jpeg_fallback", "write", "preview"]
+
+# Nodes in the synthetic workflow embedded as metadata
+WORKFLOW_NODES = 200
+
+
+def synthetic_workflow(nodes: int = WORKFLOW_NODES) -> tuple[dict, dict]:
+    """Prompt and extra_pnginfo shaped like a mid-sized ComfyUI workflow."""
+    prompt = {
+        str(i): {
+            "class_type": "KSampler",
+            "inputs": {"seed": i, "steps": 30, "cfg": 5.5, "model": [str(i - 1), 0]},
+        }
+        for i in range(1, nodes + 1)
+    }
+    workflow = {
+        "nodes": [
+            {"id": i, "type": "KSampler", "pos": [i * 10, i * 5], "widgets_values": [i, 30, 5.5]}
+            for i in range(1, nodes + 1)
+        ],
+        "links": [[i, i, 0, i + 1, 0, "MODEL"] for i in range(1, nodes)],
+    }
+    return prompt, {"workflow": workflow}
+
+
+def synthetic_batch(size: int, batch: int):
+    """(B, H, W, 3) float32 tensor in [0, 1]; each image is a shifted copy of one base image."""
+    import torch
+
+    base = synthetic_image(size)
+    frames = [np.roll(base, shift=i * 97, axis=1) for i in range(batch)]
+    return torch.from_numpy(np.stack(frames)).to(torch.float32).div_(255.0)
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process in MiB (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def output_bytes(directory: str) -> int:
+    total = 0
+    for root, _, files in os.walk(directory):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def run_case(case: dict) -> dict:
+    """Run one benchmark case; safe to call in a child process."""
+    folder_paths = install_folder_paths_stub()
+    install_comfy_args_stub()
+    save_image = load_package().nodes.save_image
+    file_writer = sys.modules[save_image.__package__ + ".file_writer"]
+
+    images = synthetic_batch(SIZES[case["size"]], case["batch"])
+    prompt, extra_pnginfo = synthetic_workflow()
+    node = save_image.LumiSaveImage()
+
+    def save(prefix: str) -> None:
+        node.save_images(
+            images,
+            filename=prefix,
+            format=case["format"],
+            oversize_format=case["oversize"],
+            effort=case["effort"],
+            async_write=case["async_write"],
+            preview=case["preview"],
+            prompt=prompt,
+            extra_pnginfo=extra_pnginfo,
+        )
+        file_writer.background_writer.flush()
+
+    # Warm up the encode pool and counter cache outside the measurement
+    save("warmup")
+    before = output_bytes(folder_paths.get_output_directory())
+
+    save_image.stage_times.reset()
+    save_image.stage_times.enabled = True
+    start = time.perf_counter()
+    for _ in range(case["repeat"]):
+        save("bench")
+    wall = time.perf_counter() - start
+    save_image.stage_times.enabled = False
+
+    count = case["batch"] * case["repeat"]
+    written = output_bytes(folder_paths.get_output_directory()) - before
+    stages = save_image.stage_times.snapshot()
+    return {
+        "images_per_sec": count / wall,
+        "mb_per_sec": written / wall / 1e6,
+        "peak_rss_mib": peak_rss_mib(),
+        "stage_ms": {name: stages.get(name, 0.0) * 1000 / count for name in STAGES},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Lumi Save Image throughput benchmark")
+    parser.add_argument("--sizes", default="1K,2K")
+    parser.add_argument("--batches", default="1,4,8")
+    parser.add_argument("--formats", default="png", help="Comma-separated output formats")
+    parser.add_argument("--oversize", default="png+jpg", choices=["png+jpg", "jpg"])
+    parser.add_argument("--effort", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed saves per case")
+    parser.add_argument("--async-write", action="store_true")
+    parser.add_argument("--preview", action="store_true", help="Also write UI previews")
+    parser.add_argument(
+        "--no-isolate", action="store_true", help="Run cases in this process (shared peak RSS)"
+    )
+    args = parser.parse_args()
+
+    cases = [
+        {
+            "size": size,
+            "batch": int(batch),
+            "format": fmt,
+            "oversize": args.oversize,
+            "effort": args.effort,
+            "repeat": args.repeat,
+            "async_write": args.async_write,
+            "preview": args.preview,
+        }
+        for size in args.sizes.split(",")
+        for batch in args.batches.split(",")
+        for fmt in args.formats.split(",")
+    ]
+
+    rows = []
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        if args.no_isolate:
+            result = run_case(case)
+        else:
+            with context.Pool(1) as pool:
+                result = pool.apply(run_case, (case,))
+        rows.append(
+            [
+                case["size"],
+                case["batch"],
+                case["format"],
+                f"{result['images_per_sec']:.2f}",
+                f"{result['mb_per_sec']:.1f}",
+                f"{result['peak_rss_mib']:.0f}",
+            ]
+            + [f"{result['stage_ms'][name]:.1f}" for name in STAGES]
+        )
+
+    print(
+        f"\noversize={args.oversize} effort={args.effort} async_write={args.async_write} "
+        f"preview={args.preview}, "
+        f"{args.repeat} saves per case; stage columns are ms per image summed over threads\n"
+    )
+    print_table(
+        ["size", "batch", "format", "img/s", "MB/s", "peak RSS MiB"]
+        + [f"{name} ms" for name in STAGES],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Shared helpers for the Lumi Tools benchmarks.
+
+The benchmarks run outside ComfyUI, so they load this checkout as a package
+and provide a minimal `folder_paths` module when ComfyUI is not importable.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import math
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE_NAME = "lumi_tools"
+
+
+def install_folder_paths_stub(base_dir: str | None = None) -> types.ModuleType:
+    """
+    Register a minimal stand-in for ComfyUI's folder_paths module.
+
+    Does nothing if the real module is importable. Output and temp directories
+    live under base_dir (a fresh temp directory by default).
+    """
+    try:
+        import folder_paths
+
+        return folder_paths
+    except ImportError:
+        pass
+
+    base_dir = base_dir or tempfile.mkdtemp(prefix="lumi-bench-")
+    module = types.ModuleType("folder_paths")
+    module.base_path = base_dir
+    module.output_directory = os.path.join(base_dir, "output")
+    module.temp_directory = os.path.join(base_dir, "temp")
+    module.folder_names_and_paths = {}
+    os.makedirs(module.output_directory, exist_ok=True)
+    os.makedirs(module.temp_directory, exist_ok=True)
+
+    def get_output_directory():
+        return module.output_directory
+
+    def get_temp_directory():
+        return module.temp_directory
+
+    def get_folder_paths(folder_name):
+        return module.folder_names_and_paths[folder_name][0][:]
+
+    def get_save_image_path(filename_prefix, output_dir, image_width=0, image_height=0):
+        # Same counter scan as ComfyUI's folder_paths.get_save_image_path
+        def map_filename(filename):
+            prefix_len = len(os.path.basename(filename_prefix))
+            prefix = filename[: prefix_len + 1]
+            try:
+                digits = int(filename[prefix_len + 1 :].split("_")[0])
+            except ValueError:
+                digits = 0
+            return digits, prefix
+
+        subfolder = os.path.dirname(os.path.normpath(filename_prefix))
+        filename = os.path.basename(os.path.normpath(filename_prefix))
+        full_output_folder = os.path.join(output_dir, subfolder)
+        try:
+            counter = (
+                max(
+                    filter(
+                        lambda a: os.path.normcase(a[1][:-1]) == os.path.normcase(filename)
+                        and a[1][-1] == "_",
+                        map(map_filename, os.listdir(full_output_folder)),
+                    )
+                )[0]
+                + 1
+            )
+        except ValueError:
+            counter = 1
+        except FileNotFoundError:
+            os.makedirs(full_output_folder, exist_ok=True)
+            counter = 1
+        return full_output_folder, filename, counter, subfolder, filename_prefix
+
+    module.get_output_directory = get_output_directory
+    module.get_temp_directory = get_temp_directory
+    module.get_folder_paths = get_folder_paths
+    module.get_save_image_path = get_save_image_path
+    sys.modules["folder_paths"] = module
+    return module
+
+
+def install_comfy_args_stub(disable_metadata: bool = False) -> None:
+    """Register a minimal comfy.cli_args so workflow metadata is written outside ComfyUI."""
+    try:
+        import comfy.cli_args  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+
+    comfy = types.ModuleType("comfy")
+    cli_args = types.ModuleType("comfy.cli_args")
+    cli_args.args = types.SimpleNamespace(disable_metadata=disable_metadata)
+    comfy.cli_args = cli_args
+    sys.modules["comfy"] = comfy
+    sys.modules["comfy.cli_args"] = cli_args
+
+
+def load_package(root: str | Path = REPO_ROOT) -> types.ModuleType:
+    """
+    Import a checkout (this one by default) as the `lumi_tools` package.
+
+    The directory name may not be a valid module name, so it is loaded by path.
+    """
+    if PACKAGE_NAME in sys.modules:
+        return sys.modules[PACKAGE_NAME]
+    root = Path(root)
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME,
+        root / "__init__.py",
+        submodule_search_locations=[str(root)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    """Print rows as a Markdown table."""
+    print("| " + " | ".join(headers) + " |")
+    print("|" + "|".join("---" for _ in headers) + "|")
+    for row in rows:
+        print("| " + " | ".join(str(cell) for cell in row) + " |")
@@ -0,0 +1,227 @@
+"""
+Local stand-in for the OpenRouter and Google AI Studio APIs.
+
+Serves:
+- GET  /api/v1/models                               (OpenRouter model list)
+- POST /api/v1/chat/completions                     (OpenRouter text and image chat)
+- POST /v1beta/models/{model}:generateContent       (Google AI Studio imagen)
+
+Latency, error rate and image payload size are configurable. Point the nodes at it with:
+
+    LUMI_OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1
+    LUMI_GOOGLE_BASE_URL=http://127.0.0.1:8765/v1beta
+
+Run standalone:
+
+    python -m benchmarks.mock_llm_server --port 8765 --latency 0.5 --image-size 2048x2048
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_png(width: int, height: int, seed: int = 0) -> bytes:
+    """Build an RGB PNG of random noise (near-incompressible, like a worst-case photo)."""
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+@dataclass
+class MockConfig:
+    """Behavior of the mock server."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    image_width: int = 1024
+    image_height: int = 1024
+    seed: int = 0
+    image_b64: str = field(default="", init=False)
+
+    def __post_init__(self):
+        # Encode once up front so serving does not measure the mock's own CPU time
+        png = make_png(self.image_width, self.image_height, self.seed)
+        self.image_b64 = base64.b64encode(png).decode("ascii")
+
+
+MOCK_MODELS = [
+    {
+        "id": "mock/text-model",
+        "name": "Mock: Text Model",
+        "context_length": 128000,
+        "pricing": {"prompt": "0.000001", "completion": "0.000002"},
+    },
+    {
+        "id": "google/gemini-3-pro-image-preview",
+        "name": "Mock: Gemini 3.0 Image",
+        "context_length": 32768,
+        "pricing": {"prompt": "0.000002", "completion": "0.00012"},
+    },
+]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def config(self) -> MockConfig:
+        return self.server.config
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _simulate(self) -> bool:
+        """Sleep for the configured latency; return False if this call should fail."""
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < self.config.error_rate:
+            self._send_json(500, {"error": {"message": "Mock server injected error"}})
+            return False
+        return True
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"data": MOCK_MODELS})
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON"}})
+            return
+
+        if self.path.endswith("/chat/completions"):
+            if self._simulate():
+                self._send_json(200, self._chat_completion(payload))
+        elif self.path.endswith(":generateContent"):
+            if self._simulate():
+                self._send_json(200, self._generate_content(payload))
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def _chat_completion(self, payload: dict) -> dict:
+        prompt_chars = len(json.dumps(payload.get("messages", [])))
+        message = {"role": "assistant", "content": "Mock response text."}
+        if "image" in payload.get("modalities", []):
+            message["images"] = [
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:image/png;base64,{self.config.image_b64}"},
+                }
+            ]
+        return {
+            "id": "mock-completion",
+            "model": payload.get("model", ""),
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": 8,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            },
+        }
+
+    def _generate_content(self, payload: dict) -> dict:
+        prompt_chars = len(json.dumps(payload.get("contents", [])))
+        parts = [
+            {"text": "Mock response text."},
+            {"inlineData": {"mimeType": "image/png", "data": self.config.image_b64}},
+        ]
+        return {
+            "candidates": [{"content": {"role": "model", "parts": parts}}],
+            "usageMetadata": {
+                "promptTokenCount": prompt_chars // 4,
+                "candidatesTokenCount": 1290,
+            },
+        }
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: MockConfig):
+        super().__init__(address, MockHandler)
+        self.config = config
+
+    @property
+    def base(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openrouter_base_url(self) -> str:
+        return f"{self.base}/api/v1"
+
+    @property
+    def google_base_url(self) -> str:
+        return f"{self.base}/v1beta"
+
+
+def start_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    """Start a mock server on a background thread (port 0 picks a free port)."""
+    server = MockServer((host, port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency (0..N s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--image-size", default="1024x1024", help="Returned image size, WxH")
+    args = parser.parse_args()
+
+    width, height = parse_size(args.image_size)
+    config = MockConfig(args.latency, args.jitter, args.error_rate, width, height)
+    server = MockServer((args.host, args.port), config)
+    print(f"OpenRouter base URL: {server.openrouter_base_url}")
+    print(f"Google base URL:     {server.google_base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,87 @@
 import { api } from "../../scripts/api.js";
 import { app } from "../../scripts/app.js";
 
-// Handle feedback from Python to update widget values
-function nodeFeedbackHandler(event) {
+// Last received value per node/widget ({ rev, value, partial }), the base for diffs
+const feedbackState = new Map();
+// Widget values waiting for the next animation frame, latest per node/widget
+const queuedFeedback = new Map();
+let feedbackFrameRequested = false;
+// node -> Map(widget name -> widget)
+const widgetCache = new WeakMap();
+
+function findWidget(node, name) {
+    let widgets = widgetCache.get(node);
+    if (!widgets) {
+        widgets = new Map();
+        widgetCache.set(node, widgets);
+    }
+    let widget = widgets.get(name);
+    if (!widget || widget.name !== name) {
+        widget = node.widgets?.find((w) => w.name === name);
+        if (widget) {
+            widgets.set(name, widget);
+        }
+    }
+    return widget;
+}
+
+function queueWidgetValue(nodeId, widgetName, value, update) {
+    queuedFeedback.set(`${nodeId}:${widgetName}`, { nodeId, widgetName, value, update });
+    if (!feedbackFrameRequested) {
+        feedbackFrameRequested = true;
+        requestAnimationFrame(applyQueuedFeedback);
+    }
+}
+
+function applyQueuedFeedback() {
+    feedbackFrameRequested = false;
     const nodes = app.graph._nodes_by_id;
-    const node = nodes[event.detail.node_id];
-    if (node) {
-        const widget = node.widgets.find((w) => event.detail.widget_name === w.name);
+    for (const { nodeId, widgetName, value, update } of queuedFeedback.values()) {
+        const node = nodes[nodeId];
+        const widget = node && findWidget(node, widgetName);
         if (widget) {
-            widget.value = event.detail.value;
+            widget.value = value;
+            node.onLumiFeedback?.(widgetName, update);
+        }
+    }
+    queuedFeedback.clear();
+}
+
+function storeFeedback(update, value) {
+    const partial = update.length !== undefined;
+    feedbackState.set(`${update.node_id}:${update.widget_name}`, { rev: update.rev, value, partial });
+    const shown = partial ? `${value}\n… (${update.length - value.length} more characters)` : value;
+    queueWidgetValue(update.node_id, update.widget_name, shown, update);
+}
+
+// Diff against a revision this client does not have: fetch the full value instead
+async function fetchFeedbackValue(update) {
+    const params = new URLSearchParams({ node_id: update.node_id, widget_name: update.widget_name });
+    const response = await api.fetchApi(`/lumi/feedback?${params}`);
+    if (response.ok) {
+        const data = await response.json();
+        const state = feedbackState.get(`${update.node_id}:${update.widget_name}`);
+        if (state && state.rev > data.rev) {
+            return;
+        }
+        storeFeedback({ ...update, rev: data.rev }, data.value);
+    }
+}
+
+// Handle batched feedback from Python to update widget values
+function nodeFeedbackHandler(event) {
+    const updates = event.detail.updates ?? [event.detail];
+    for (const update of updates) {
+        if (update.diff) {
+            const state = feedbackState.get(`${update.node_id}:${update.widget_name}`);
+            if (!state || state.partial || state.rev !== update.rev - 1) {
+                fetchFeedbackValue(update);
+                continue;
+            }
+            const { start, end, text } = update.diff;
+            storeFeedback(update, state.value.slice(0, start) + text + state.value.slice(end));
+        } else {
+            storeFeedback(update, update.value);
         }
     }
 }
@@ -23,10 +96,85 @@ app.registerExtension({
             setupWildcardProcessorNode(nodeType, nodeData);
         } else if (nodeData.name === "LumiWildcardEncode") {
             setupWildcardEncodeNode(nodeType, nodeData);
+        } else if (nodeData.name === "LumiShowText") {
+            setupShowTextNode(nodeType, nodeData);
         }
     }
 });
 
+function setupShowTextNode(nodeType, nodeData) {
+    const onNodeCreated = nodeType.prototype.onNodeCreated;
+    nodeType.prototype.onNodeCreated = function () {
+        if (onNodeCreated) {
+            onNodeCreated.apply(this, arguments);
+        }
+
+        const node = this;
+        const displayedTextWidget = this.widgets.find((w) => w.name === "displayed_text");
+        // { offset, limit, total, first } of the shown page in first/last mode, null in all
+        // mode; first is the oldest item the server still has (0 until a page is fetched)
+        let page = null;
+
+        const updatePager = () => {
+            if (page) {
+                const end = Math.min(page.offset + page.limit, page.total);
+                prevButton.label = `◀ Items ${page.offset + 1}-${end} of ${page.total}`;
+                nextButton.label = "Next page ▶";
+            } else {
+                prevButton.label = "◀ Previous page";
+                nextButton.label = "Next page ▶";
+            }
+            node.setDirtyCanvas(true, false);
+        };
+
+        // Fetch the previous (-1) or next (1) page from the server-side buffer
+        const showPage = async (direction) => {
+            if (!page) {
+                return;
+            }
+            // Last-mode pages need not start on a multiple of limit, so going
+            // back clamps to the first available item instead of stopping short of it
+            const first = page.first ?? 0;
+            if (direction < 0 ? page.offset <= first : page.offset + page.limit >= page.total) {
+                return;
+            }
+            const offset = Math.max(first, page.offset + direction * page.limit);
+            const params = new URLSearchParams({ node_id: node.id, offset, limit: page.limit });
+            const response = await api.fetchApi(`/lumi/show_text?${params}`);
+            if (!response.ok) {
+                return;
+            }
+            const data = await response.json();
+            page = {
+                offset: data.offset,
+                limit: page.limit,
+                total: data.total,
+                first: data.first,
+            };
+            if (displayedTextWidget) {
+                displayedTextWidget.value = data.items.join("\n");
+            }
+            updatePager();
+        };
+
+        const prevButton = this.addWidget("button", "previous_page", null, () => showPage(-1), {
+            serialize: false,
+        });
+        const nextButton = this.addWidget("button", "next_page", null, () => showPage(1), {
+            serialize: false,
+        });
+        updatePager();
+
+        // Page position sent with each run's first/last page
+        this.onLumiFeedback = (widgetName, update) => {
+            if (widgetName === "displayed_text") {
+                page = update?.page ?? null;
+                updatePager();
+            }
+        };
+    };
+}
+
 function setupWildcardProcessorNode(nodeType, nodeData) {
     const onNodeCreated = nodeType.prototype.onNodeCreated;
     nodeType.prototype.onNodeCreated = function () {
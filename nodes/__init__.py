@@ -1,34 +1,82 @@
-# Node exports
-from .llm_imagen_processor import (
-    LumiGeminiImagenConfig,
-    LumiGoogleImagenProvider,
-    LumiLLMImagenProcessor,
-    LumiOpenRouterImagenProvider,
-)
-from .llm_prompt_processor import LumiLLMPromptProcessor
-from .noise_to_seed import LumiNoiseToSeed
-from .openrouter_provider import LumiOpenRouterProvider
-from .save_image import LumiSaveImage
-from .seed import LumiSeed
-from .show_text import LumiShowText
-from .shuffle_prompt import LumiShufflePrompt
-from .text_input import LumiTextInput
-from .wildcard_processor import LumiWildcardProcessor
-from .wrap_text import LumiWrapText
-
-__all__ = [
-    "LumiNoiseToSeed",
-    "LumiSeed",
-    "LumiShowText",
-    "LumiShufflePrompt",
-    "LumiTextInput",
-    "LumiWildcardProcessor",
-    "LumiOpenRouterProvider",
-    "LumiLLMPromptProcessor",
-    "LumiWrapText",
-    "LumiGeminiImagenConfig",
-    "LumiOpenRouterImagenProvider",
-    "LumiGoogleImagenProvider",
-    "LumiLLMImagenProcessor",
-    "LumiSaveImage",
-]
+"""
+Lumi node classes.
+
+Each class is imported from its module on first access (attribute lookup or
+LazyNodeMapping), so importing this package does not load every node module.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Iterator, Mapping
+
+from .startup_profile import startup_profile
+
+# Node class name -> defining module
+NODE_MODULES = {
+    "LumiNoiseToSeed": ".noise_to_seed",
+    "LumiSeed": ".seed",
+    "LumiSeedSweep": ".seed",
+    "LumiShowText": ".show_text",
+    "LumiShufflePrompt": ".shuffle_prompt",
+    "LumiShufflePromptList": ".shuffle_prompt",
+    "LumiTextInput": ".text_input",
+    "LumiWildcardProcessor": ".wildcard_processor",
+    "LumiOpenRouterProvider": ".openrouter_provider",
+    "LumiLLMPromptProcessor": ".llm_prompt_processor",
+    "LumiWrapText": ".wrap_text",
+    "LumiComposeText": ".compose_text",
+    "LumiGeminiImagenConfig": ".llm_imagen_processor",
+    "LumiOpenRouterImagenProvider": ".llm_imagen_processor",
+    "LumiGoogleImagenProvider": ".llm_imagen_processor",
+    "LumiLLMImagenProcessor": ".llm_imagen_processor",
+    "LumiSaveImage": ".save_image",
+}
+
+
+def __getattr__(name: str):
+    module = NODE_MODULES.get(name)
+    if module is None:
+        # Submodules not imported yet (e.g. nodes.save_image)
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # LazyNodeMapping calls this for every lookup, not only for missing attributes
+    if name in globals():
+        return globals()[name]
+    with startup_profile.phase(name, kind="import"):
+        node_class = getattr(importlib.import_module(module, __name__), name)
+    startup_profile.wrap_input_types(name, node_class)
+    globals()[name] = node_class
+    return node_class
+
+
+class LazyNodeMapping(Mapping):
+    """Read-only node name -> class mapping that imports each class on first lookup."""
+
+    def __init__(self, names: list[str]):
+        self._names = list(names)
+        startup_profile.expect_nodes(self._names)
+
+    def __getitem__(self, name: str):
+        if name not in self._names:
+            raise KeyError(name)
+        return __getattr__(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __repr__(self) -> str:
+        return f"LazyNodeMapping({self._names!r})"
+
+
+__all__ = list(NODE_MODULES)
@@ -0,0 +1,206 @@
+"""
+Vectorized token shuffles that match random.Random(seed).shuffle exactly.
+
+Runs one MT19937 stream per seed side by side in numpy: seeding, twisting and
+the rejection-sampled index draws of Python's shuffle are applied to all
+seeds at once, so thousands of permutations cost a few hundred array
+operations instead of thousands of Python-level shuffles.
+
+Used by Lumi Shuffle Prompt List.
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+# MT19937 parameters (as in CPython's _randommodule.c)
+N = 624
+M = 397
+MATRIX_A = np.uint32(0x9908B0DF)
+UPPER_MASK = np.uint32(0x80000000)
+LOWER_MASK = np.uint32(0x7FFFFFFF)
+
+# Seeds generated together (each holds two 2.5KB state buffers)
+CHUNK_SEEDS = 4096
+
+# Below this many seeds the fixed numpy cost outweighs per-seed random.Random
+VECTORIZE_MIN_SEEDS = 512
+
+
+def _seed_key(seed: int) -> list[int]:
+    """32-bit little-endian key words of a non-negative int seed, as random.seed builds them."""
+    seed = abs(seed)
+    key = []
+    while seed:
+        key.append(seed & 0xFFFFFFFF)
+        seed >>= 32
+    return key or [0]
+
+
+def _init_genrand(s: int) -> np.ndarray:
+    mt = np.empty(N, dtype=np.uint32)
+    mt[0] = s
+    for i in range(1, N):
+        prev = int(mt[i - 1])
+        mt[i] = (1812433253 * (prev ^ (prev >> 30)) + i) & 0xFFFFFFFF
+    return mt
+
+
+def _init_by_array(keys: np.ndarray) -> np.ndarray:
+    """Seed one state per column of keys, shape (key_length, lanes)."""
+    key_length, lanes = keys.shape
+    mt = np.repeat(_init_genrand(19650218)[:, np.newaxis], lanes, axis=1)
+    tmp = np.empty(lanes, dtype=np.uint32)
+    i, j = 1, 0
+    with np.errstate(over="ignore"):
+        for _ in range(max(N, key_length)):
+            np.right_shift(mt[i - 1], np.uint32(30), out=tmp)
+            tmp ^= mt[i - 1]
+            tmp *= np.uint32(1664525)
+            mt[i] ^= tmp
+            mt[i] += keys[j]
+            mt[i] += np.uint32(j)
+            i += 1
+            j += 1
+            if i >= N:
+                mt[0] = mt[N - 1]
+                i = 1
+            if j >= key_length:
+                j = 0
+        for _ in range(N - 1):
+            np.right_shift(mt[i - 1], np.uint32(30), out=tmp)
+            tmp ^= mt[i - 1]
+            tmp *= np.uint32(1566083941)
+            mt[i] ^= tmp
+            mt[i] -= np.uint32(i)
+            i += 1
+            if i >= N:
+                mt[0] = mt[N - 1]
+                i = 1
+    mt[0] = UPPER_MASK
+    return mt
+
+
+# Row ranges regenerated together. Rows are produced in order; a range never
+# crosses N - M (where the source switches to already regenerated rows) and
+# the last row, which reads the new row 0, is its own range
+_BOUNDS = sorted(set(range(0, N, 64)) | {N - M, 2 * (N - M), N - 1, N})
+_SEGMENTS = list(zip(_BOUNDS[:-1], _BOUNDS[1:], strict=True))
+
+
+def _twist_rows(mt: np.ndarray, lo: int, hi: int) -> None:
+    """Regenerate rows [lo, hi) of (N, lanes) states in place; rows below lo must be done."""
+    if lo == N - 1:
+        y = (mt[N - 1] & UPPER_MASK) | (mt[0] & LOWER_MASK)
+        mt[N - 1] = mt[M - 1] ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * MATRIX_A)
+        return
+    y = (mt[lo:hi] & UPPER_MASK) | (mt[lo + 1 : hi + 1] & LOWER_MASK)
+    offset = M - N if lo >= N - M else M
+    mt[lo:hi] = (
+        mt[lo + offset : hi + offset] ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * MATRIX_A)
+    )
+
+
+def _temper(mt: np.ndarray) -> np.ndarray:
+    y = mt ^ (mt >> np.uint32(11))
+    y ^= (y << np.uint32(7)) & np.uint32(0x9D2C5680)
+    y ^= (y << np.uint32(15)) & np.uint32(0xEFC60000)
+    return y ^ (y >> np.uint32(18))
+
+
+class MT19937Batch:
+    """
+    Independent MT19937 streams, one per seed, seeded like random.Random(seed).
+
+    States are stored word-major, (N, lanes), so every step is a contiguous row
+    operation. The first twist is done lazily in row ranges, since a short
+    shuffle only consumes the first few dozen outputs of each stream.
+    """
+
+    def __init__(self, seeds: list[int]):
+        keys = [_seed_key(seed) for seed in seeds]
+        key_lengths = {len(key) for key in keys}
+        if len(key_lengths) == 1:
+            self.mt = _init_by_array(np.array(keys, dtype=np.uint32).T)
+        else:
+            # Seeds with the same key length are seeded together
+            self.mt = np.empty((N, len(seeds)), dtype=np.uint32)
+            for key_length in key_lengths:
+                lanes = [lane for lane, key in enumerate(keys) if len(key) == key_length]
+                group = np.array([keys[lane] for lane in lanes], dtype=np.uint32).T
+                self.mt[:, lanes] = _init_by_array(group)
+        self.out = np.empty_like(self.mt)
+        self.pos = np.zeros(len(seeds), dtype=np.intp)
+        # Rows of the first twisted state generated so far (for every lane)
+        self.ready = 0
+        self._segments = iter(_SEGMENTS)
+
+    def next_uint32(self, lanes: np.ndarray) -> np.ndarray:
+        """Next 32-bit output of each lane in lanes (an index array)."""
+        pos = self.pos[lanes]
+        top = int(pos.max())
+        while self.ready <= top and self.ready < N:
+            lo, hi = next(self._segments)
+            _twist_rows(self.mt, lo, hi)
+            self.out[lo:hi] = _temper(self.mt[lo:hi])
+            self.ready = hi
+        if top >= N:
+            # Rarely needed later twists, done in full for the lanes that ran out
+            exhausted = lanes[pos >= N]
+            state = self.mt[:, exhausted]
+            for lo, hi in _SEGMENTS:
+                _twist_rows(state, lo, hi)
+            self.mt[:, exhausted] = state
+            self.out[:, exhausted] = _temper(state)
+            self.pos[exhausted] = 0
+            pos = self.pos[lanes]
+        self.pos[lanes] = pos + 1
+        return self.out[pos, lanes]
+
+
+def _shuffle_chunk(seeds: list[int], n: int) -> np.ndarray:
+    # Positions are stored (n, lanes) so each Fisher-Yates step updates a contiguous row
+    perms = np.repeat(np.arange(n, dtype=np.intp)[:, np.newaxis], len(seeds), axis=1)
+    streams = MT19937Batch(seeds)
+    all_lanes = np.arange(len(seeds))
+    picks = np.empty(len(seeds), dtype=np.intp)
+    for i in range(n - 1, 0, -1):
+        bound = i + 1
+        shift = np.uint32(32 - bound.bit_length())
+        pending = all_lanes
+        while pending.size:
+            draws = streams.next_uint32(pending) >> shift
+            accepted = draws < bound
+            picks[pending[accepted]] = draws[accepted]
+            pending = pending[~accepted]
+        current = perms[i].copy()
+        perms[i] = perms[picks, all_lanes]
+        perms[picks, all_lanes] = current
+    return perms.T
+
+
+def shuffle_permutations(seeds: list[int], n: int) -> np.ndarray:
+    """
+    Permutations of range(n), one row per seed.
+
+    Row k equals the order random.Random(seeds[k]).shuffle(list(range(n)))
+    produces: Fisher-Yates from the end, with each index drawn by
+    getrandbits(bit_length) and rejection of out-of-range values. Seeds are
+    processed CHUNK_SEEDS at a time to bound memory; small batches use
+    random.Random directly.
+    """
+    if n < 2 or len(seeds) < VECTORIZE_MIN_SEEDS:
+        perms = np.tile(np.arange(n, dtype=np.intp), (len(seeds), 1))
+        for row, seed in zip(perms, seeds, strict=True):
+            order = list(range(n))
+            random.Random(seed).shuffle(order)
+            row[:] = order
+        return perms
+    return np.concatenate(
+        [
+            _shuffle_chunk(seeds[start : start + CHUNK_SEEDS], n)
+            for start in range(0, len(seeds), CHUNK_SEEDS)
+        ]
+    )
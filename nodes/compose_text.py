@@ -0,0 +1,105 @@
+"""
+Compose Text node - builds text from a template and named inputs in one pass.
+"""
+
+from __future__ import annotations
+
+import functools
+from string import Formatter
+
+# Named STRING inputs the template can reference as {a} ... {h}
+INPUT_NAMES = ("a", "b", "c", "d", "e", "f", "g", "h")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_template(template: str) -> tuple[tuple[str, str | None], ...]:
+    """
+    Split a template into (literal text, input name or None) pieces.
+
+    Placeholders are {name} for the named inputs; {{ and }} give literal
+    braces. Format specs, conversions and attribute or index access are
+    rejected. Compiled templates are cached, so repeated runs and list items
+    sharing a template parse it once.
+    """
+    pieces = []
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid template: {e}") from e
+    for literal, field, spec, conversion in parsed:
+        if field is not None:
+            if field not in INPUT_NAMES:
+                raise ValueError(
+                    f"Unknown template placeholder {{{field}}}; use one of "
+                    + ", ".join(f"{{{name}}}" for name in INPUT_NAMES)
+                )
+            if spec or conversion:
+                raise ValueError(f"Placeholder {{{field}}} cannot have a format spec or conversion")
+        pieces.append((literal, field))
+    return tuple(pieces)
+
+
+def render_template(pieces: tuple[tuple[str, str | None], ...], values: dict[str, str]) -> str:
+    """Fill a compiled template; inputs that are not connected render as empty text."""
+    parts = []
+    for literal, field in pieces:
+        parts.append(literal)
+        if field is not None:
+            parts.append(values.get(field, ""))
+    return "".join(parts)
+
+
+class LumiComposeText:
+    """
+    Composes text from a template with up to eight named inputs.
+
+    Replaces chains of Wrap Text nodes: the whole prompt is one template such
+    as "{a}, {b} in {c}, {d}". All inputs take lists; the output has one
+    string per item of the longest list and shorter lists repeat their last
+    item, as ComfyUI does for list inputs.
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "template": (
+                    "STRING",
+                    {
+                        "multiline": True,
+                        "default": "{a}, {b}",
+                        "tooltip": "Text with {a} ... {h} placeholders; {{ and }} for literal braces",
+                    },
+                ),
+            },
+            "optional": {
+                name: (
+                    "STRING",
+                    {"forceInput": True, "tooltip": f"Text for {{{name}}} in the template"},
+                )
+                for name in INPUT_NAMES
+            },
+        }
+
+    INPUT_IS_LIST = True
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("text",)
+    OUTPUT_IS_LIST = (True,)
+    FUNCTION = "compose"
+    CATEGORY = "Lumi/Text"
+
+    DESCRIPTION = (
+        "Builds text from a template with {a} ... {h} placeholders filled from the named "
+        "inputs, in one pass. List inputs produce one string per item."
+    )
+
+    def compose(self, template: list[str], **inputs: list[str]) -> tuple[list[str]]:
+        lists = {name: values for name, values in inputs.items() if values}
+        count = max([len(template)] + [len(values) for values in lists.values()])
+
+        results = []
+        for i in range(count):
+            pieces = compile_template(template[min(i, len(template) - 1)])
+            values = {name: values[min(i, len(values) - 1)] for name, values in lists.items()}
+            results.append(render_template(pieces, values))
+        return (results,)
@@ -0,0 +1,172 @@
+"""
+Coalesced widget feedback from nodes to the UI.
+
+Nodes queue widget values with send_widget_value() instead of calling
+PromptServer.send_sync per execution. Values are collected for a short window
+(LUMI_FEEDBACK_WINDOW_MS, default 50), only the latest value per node/widget
+is kept, and everything pending is sent as one "lumi-node-feedback" message:
+
+    {"updates": [{"node_id", "widget_name", "rev", "value" | "diff", ...}]}
+
+Unchanged display-only values are dropped. Large values that mostly match
+the previous one are sent as a splice diff ({"start", "end", "text"} against
+revision rev - 1), and display-only values longer than LUMI_FEEDBACK_MAX_CHARS
+are cut to a preview with "length" set to the full size. Exposed through the ComfyUI server:
+- GET /lumi/feedback?node_id=...&widget_name=...   full last value and revision
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from server import PromptServer
+
+    HAS_SERVER = True
+except ImportError:
+    HAS_SERVER = False
+
+if HAS_SERVER:
+    from aiohttp import web
+
+# Values smaller than this are always sent whole
+DIFF_MIN_CHARS = 1024
+
+# Node/widget values remembered for diffs and the full-value route
+MAX_TRACKED_WIDGETS = 256
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _splice_diff(old: str, new: str) -> Tuple[int, int, str]:
+    """(start, end, text) such that old[:start] + text + old[end:] == new."""
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    suffix = 0
+    while suffix < limit - start and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return start, len(old) - suffix, new[start : len(new) - suffix]
+
+
+class FeedbackDispatcher:
+    """Collects widget updates and sends them in batches from a timer thread."""
+
+    def __init__(self, window: float, max_chars: int, send=None):
+        self.window = window
+        self.max_chars = max_chars
+        self._send = send
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Tuple[str, bool, dict]] = {}
+        # (node_id, widget_name) -> [rev, full value, whether the client got it whole, extra]
+        self._sent: OrderedDict = OrderedDict()
+        self._timer: Optional[threading.Timer] = None
+
+    def send_widget_value(
+        self, node_id: Any, widget_name: str, value: str, preview=False, **extra
+    ) -> None:
+        """
+        Queue a widget value for the UI.
+
+        preview marks display-only widgets, whose value may be truncated in
+        the message; editable widgets (read back as node inputs) always
+        receive the full text. Extra keyword arguments are added to the update
+        as is (e.g. Show Text's page position). node_id may be wrapped in a
+        one-element list, as hidden inputs are for INPUT_IS_LIST nodes.
+        """
+        if isinstance(node_id, (list, tuple)) and len(node_id) == 1:
+            node_id = node_id[0]
+        key = (str(node_id), widget_name)
+        with self._lock:
+            self._pending[key] = (value, preview, extra)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _build_update(
+        self, key: Tuple[str, str], value: str, preview: bool, extra: dict
+    ) -> Optional[dict]:
+        sent = self._sent.get(key)
+        # Unchanged editable widgets are still resent: the user may have edited them
+        if preview and sent is not None and sent[1] == value and sent[3] == extra:
+            self._sent.move_to_end(key)
+            return None
+
+        rev = sent[0] + 1 if sent is not None else 1
+        update: Dict[str, Any] = {**extra, "node_id": key[0], "widget_name": key[1], "rev": rev}
+        whole = True
+        if preview and len(value) > self.max_chars:
+            update["value"] = value[: self.max_chars]
+            update["length"] = len(value)
+            whole = False
+        elif sent is not None and sent[2] and len(value) >= DIFF_MIN_CHARS:
+            start, end, text = _splice_diff(sent[1], value)
+            if len(text) < len(value) // 2:
+                update["diff"] = {"start": start, "end": end, "text": text}
+            else:
+                update["value"] = value
+        else:
+            update["value"] = value
+
+        self._sent[key] = [rev, value, whole, extra]
+        self._sent.move_to_end(key)
+        while len(self._sent) > MAX_TRACKED_WIDGETS:
+            self._sent.popitem(last=False)
+        return update
+
+    def flush(self) -> None:
+        """Send everything pending now as one message."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._timer = None
+            updates: List[dict] = []
+            for key, (value, preview, extra) in pending.items():
+                update = self._build_update(key, value, preview, extra)
+                if update is not None:
+                    updates.append(update)
+        if updates:
+            send = self._send or PromptServer.instance.send_sync
+            send("lumi-node-feedback", {"updates": updates})
+
+    def get_value(self, node_id: str, widget_name: str) -> Optional[dict]:
+        """Last sent full value of a widget, for clients that missed a revision."""
+        with self._lock:
+            sent = self._sent.get((node_id, widget_name))
+            if sent is None:
+                return None
+            return {"rev": sent[0], "value": sent[1]}
+
+
+# Global feedback dispatcher instance
+feedback = FeedbackDispatcher(
+    window=_env_int("LUMI_FEEDBACK_WINDOW_MS", 50) / 1000,
+    max_chars=_env_int("LUMI_FEEDBACK_MAX_CHARS", 65536),
+)
+
+
+def send_widget_value(
+    node_id: Any, widget_name: str, value: str, preview: bool = False, **extra
+) -> None:
+    """Queue a widget update on the global dispatcher (no-op outside ComfyUI)."""
+    if HAS_SERVER and node_id is not None:
+        feedback.send_widget_value(node_id, widget_name, value, preview=preview, **extra)
+
+
+if HAS_SERVER:
+
+    @PromptServer.instance.routes.get("/lumi/feedback")
+    async def get_feedback_value(request):
+        value = feedback.get_value(
+            request.query.get("node_id", ""), request.query.get("widget_name", "")
+        )
+        if value is None:
+            return web.json_response({"error": "unknown widget"}, status=404)
+        return web.json_response(value)
@@ -0,0 +1,151 @@
+"""
+Crash-safe file writing for Lumi Save Image.
+
+Files are written to a hidden temp file in the target directory and atomically
+renamed into place, so a crash never leaves a truncated image under the final
+name. An optional background writer lets the node return once encoding is done.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+
+# fsync policies: none, fsync the file, or fsync the file and its directory entry
+FSYNC_POLICIES = ["none", "file", "file+dir"]
+
+# Encoded bytes allowed to wait in the background writer before submit() blocks
+ASYNC_MAX_PENDING_BYTES = 512 * 1024 * 1024
+
+# Background writer threads (parallel writes help on network storage)
+ASYNC_WRITER_THREADS = 2
+
+
+def _fsync_dir(directory: str) -> None:
+    """Persist a directory entry (rename) on POSIX; not supported on Windows."""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: str, data: bytes, fsync: str = "none") -> None:
+    """Write data to path via a temp file and atomic rename."""
+    directory = os.path.dirname(path) or "."
+    # Leading dot keeps the temp file out of ComfyUI's counter scan
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(tmp_path, flags, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == "file+dir":
+        _fsync_dir(directory)
+
+
+class BackgroundWriter:
+    """
+    Writes files on background threads with a bounded amount of pending data.
+
+    submit() blocks while more than max_pending_bytes are queued, so a slow
+    output directory applies back-pressure instead of growing memory. Write
+    errors are logged, since the submitting node has already returned.
+    Queued files are still written when the interpreter exits.
+    """
+
+    def __init__(
+        self,
+        max_pending_bytes: int = ASYNC_MAX_PENDING_BYTES,
+        threads: int = ASYNC_WRITER_THREADS,
+    ):
+        self.max_pending_bytes = max_pending_bytes
+        self.threads = threads
+        self._cond = threading.Condition()
+        self._queue: deque = deque()
+        self._pending_bytes = 0
+        self._in_flight = 0
+        # Paths queued or being written, with the number of writes pending for each
+        self._paths: dict[str, int] = {}
+        self._workers: list[threading.Thread] = []
+
+    def submit(self, path: str, data: bytes, fsync: str = "none") -> None:
+        """Queue a file for writing, blocking while the pending byte budget is exhausted."""
+        with self._cond:
+            while self._pending_bytes and self._pending_bytes + len(data) > self.max_pending_bytes:
+                self._cond.wait()
+            self._queue.append((path, data, fsync))
+            self._pending_bytes += len(data)
+            self._in_flight += 1
+            self._paths[path] = self._paths.get(path, 0) + 1
+            if len(self._workers) < self.threads:
+                if not self._workers:
+                    # Daemon threads die at exit, so drain the queue first
+                    atexit.register(self.flush)
+                worker = threading.Thread(target=self._run, name="lumi-writer", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        """Number of files queued or being written."""
+        with self._cond:
+            return self._in_flight
+
+    def is_pending(self, path: str) -> bool:
+        """Whether a file is queued or being written to path."""
+        with self._cond:
+            return path in self._paths
+
+    def has_pending(self, prefix: str) -> bool:
+        """Whether any file queued or being written has a path starting with prefix."""
+        with self._cond:
+            return any(path.startswith(prefix) for path in self._paths)
+
+    def flush(self) -> None:
+        """Block until every submitted file has been written."""
+        with self._cond:
+            while self._in_flight:
+                self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                path, data, fsync = self._queue.popleft()
+            try:
+                write_atomic(path, data, fsync)
+            except Exception as e:
+                logging.error(f"Lumi background write failed for {path}: {e}")
+            finally:
+                with self._cond:
+                    self._pending_bytes -= len(data)
+                    self._in_flight -= 1
+                    if self._paths[path] == 1:
+                        del self._paths[path]
+                    else:
+                        self._paths[path] -= 1
+                    self._cond.notify_all()
+
+
+# Global background writer instance
+background_writer = BackgroundWriter()
@@ -0,0 +1,294 @@
+"""
+Image encoding helpers for Lumi Save Image.
+
+Encodes uint8 images to PNG, WebP, AVIF and JPEG XL in memory and embeds the
+ComfyUI workflow metadata in each format. Already-encoded PNG and JPEG bytes
+can have the metadata spliced in without decoding.
+
+numpy, PIL and the optional Pillow plugins are imported on first use.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import struct
+import zlib
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image
+    from PIL.PngImagePlugin import PngInfo
+
+# File extension per output format
+FORMAT_EXTENSIONS = {
+    "png": "png",
+    "webp": "webp",
+    "webp_lossless": "webp",
+    "avif": "avif",
+    "jxl": "jxl",
+    "jxl_lossless": "jxl",
+}
+
+# Row bands sampled to predict PNG size
+ESTIMATE_BANDS = 8
+ESTIMATE_BAND_ROWS = 16
+
+
+@functools.cache
+def _load_plugins() -> tuple[bool, bool]:
+    """Register the optional Pillow plugins: AVIF for Pillow < 11.2, JPEG XL for any Pillow."""
+    try:
+        import pillow_avif  # noqa: F401
+
+        has_avif = True
+    except ImportError:
+        has_avif = False
+
+    try:
+        import pillow_jxl  # noqa: F401
+
+        has_jxl = True
+    except ImportError:
+        has_jxl = False
+
+    return has_avif, has_jxl
+
+
+def _pillow_supports(module: str) -> bool:
+    from PIL import features
+
+    try:
+        return features.check_module(module)
+    except ValueError:
+        # Module unknown to this Pillow version
+        return False
+
+
+def get_output_formats() -> list[str]:
+    """Get the output formats this Pillow build can write."""
+    has_avif, has_jxl = _load_plugins()
+    formats = ["png"]
+    if _pillow_supports("webp"):
+        formats += ["webp", "webp_lossless"]
+    if has_avif or _pillow_supports("avif"):
+        formats.append("avif")
+    if has_jxl:
+        formats += ["jxl", "jxl_lossless"]
+    return formats
+
+
+def serialize_metadata(prompt, extra_pnginfo) -> list[tuple[str, str]] | None:
+    """
+    Serialize the workflow metadata to (key, JSON text) pairs.
+
+    Returns None if metadata is disabled. The texts can be packed for several
+    output formats with pack_metadata without serializing again.
+    """
+    try:
+        from comfy.cli_args import args
+
+        if args.disable_metadata:
+            return None
+    except Exception:
+        # If we can't access args, just skip metadata
+        return None
+
+    texts = []
+    if prompt is not None:
+        texts.append(("prompt", json.dumps(prompt)))
+    if extra_pnginfo is not None:
+        for x in extra_pnginfo:
+            texts.append((x, json.dumps(extra_pnginfo[x])))
+    return texts
+
+
+def build_metadata(prompt, extra_pnginfo, fmt: str = "png", compress: bool = False):
+    """Serialize and pack the workflow metadata for one output format (see pack_metadata)."""
+    return pack_metadata(serialize_metadata(prompt, extra_pnginfo), fmt, compress)
+
+
+def pack_metadata(texts: list[tuple[str, str]] | None, fmt: str = "png", compress: bool = False):
+    """
+    Pack serialized workflow metadata for one output format.
+
+    Returns PngInfo text chunks for PNG (compressed iTXt when compress is set) and EXIF
+    bytes for the other formats, using the same tags as ComfyUI's WebP saver.
+    Returns None if metadata is disabled.
+    """
+    if texts is None:
+        return None
+
+    if fmt == "png":
+        from PIL.PngImagePlugin import PngInfo
+
+        metadata = PngInfo()
+        for key, text in texts:
+            if compress:
+                metadata.add_itxt(key, text, zip=True)
+            else:
+                metadata.add_text(key, text)
+        return metadata
+
+    from PIL import Image
+
+    exif = Image.Exif()
+    tag = 0x010F
+    for key, text in texts:
+        if key == "prompt":
+            exif[0x0110] = f"prompt:{text}"
+        else:
+            exif[tag] = f"{key}:{text}"
+            tag -= 1
+    return exif.tobytes()
+
+
+def encode_png(img: Image.Image, metadata, compress_level: int) -> bytes:
+    """Encode an image to PNG bytes in memory."""
+    buffer = BytesIO()
+    img.save(buffer, format="PNG", pnginfo=metadata, compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def encode_jpeg(img: Image.Image, quality: int, exif: bytes | None = None) -> bytes:
+    """
+    Encode an image to JPEG bytes in memory (RGBA/P images are converted to RGB).
+
+    exif (e.g. from pack_metadata(..., "jpg")) is embedded when it fits in
+    one JPEG segment and left out otherwise.
+    """
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+    options = {}
+    if exif and len(exif) <= JPEG_MAX_SEGMENT:
+        options["exif"] = exif
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=quality, optimize=True, **options)
+    return buffer.getvalue()
+
+
+def estimate_png_size(pixels: np.ndarray, compress_level: int) -> int:
+    """
+    Predict the PNG size of an image by encoding evenly spaced row bands.
+
+    Returns 0 when the image is too small for sampling to be cheaper than encoding.
+    """
+    import numpy as np
+    from PIL import Image
+
+    height = pixels.shape[0]
+    sample_rows = ESTIMATE_BANDS * ESTIMATE_BAND_ROWS
+    if height < sample_rows * 4:
+        return 0
+    starts = np.linspace(0, height - ESTIMATE_BAND_ROWS, ESTIMATE_BANDS).astype(int)
+    sample = np.concatenate([pixels[s : s + ESTIMATE_BAND_ROWS] for s in starts])
+    sample_size = len(encode_png(Image.fromarray(sample), None, compress_level))
+    return sample_size * height // sample_rows
+
+
+def encode_image(img: Image.Image, fmt: str, metadata, quality: int, effort: int) -> bytes:
+    """
+    Encode an image in memory.
+
+    effort (0-9) trades encode time for size: it is the PNG compress level and
+    is mapped onto the WebP method, AVIF speed and JPEG XL effort scales.
+    quality (1-100) applies to the lossy formats.
+    """
+    if fmt == "png":
+        return encode_png(img, metadata, effort)
+
+    # Registers the AVIF/JPEG XL encoders when they come from plugins
+    _load_plugins()
+
+    options = {}
+    if metadata:
+        options["exif"] = metadata
+
+    if fmt in ("webp", "webp_lossless"):
+        options.update(format="WEBP", method=round(effort * 6 / 9))
+        if fmt == "webp_lossless":
+            # In lossless mode, quality is the compression effort
+            options.update(lossless=True, quality=round(effort * 100 / 9))
+        else:
+            options["quality"] = quality
+    elif fmt == "avif":
+        options.update(format="AVIF", quality=quality, speed=10 - round(effort * 10 / 9))
+    elif fmt in ("jxl", "jxl_lossless"):
+        options.update(format="JXL", effort=1 + round(effort * 8 / 9))
+        if fmt == "jxl_lossless":
+            options["lossless"] = True
+        else:
+            options["quality"] = quality
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+    buffer = BytesIO()
+    img.save(buffer, **options)
+    return buffer.getvalue()
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Largest JPEG APP1 payload (the 16-bit segment length includes its own 2 bytes)
+JPEG_MAX_SEGMENT = 0xFFFF - 2
+
+
+def sniff_format(data: bytes) -> str | None:
+    """Identify encoded image bytes as "png" or "jpg" from their signature."""
+    if data.startswith(PNG_SIGNATURE):
+        return "png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    return None
+
+
+def _png_chunk(cid: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + cid + data + struct.pack(">I", zlib.crc32(cid + data))
+
+
+def inject_png_metadata(data: bytes, metadata: PngInfo) -> bytes | None:
+    """
+    Insert the text chunks of a PngInfo into encoded PNG bytes right after IHDR.
+
+    Returns None if data does not start with a well-formed IHDR chunk.
+    """
+    ihdr_end = len(PNG_SIGNATURE) + 8 + 13 + 4
+    if not data.startswith(PNG_SIGNATURE) or data[12:16] != b"IHDR" or len(data) < ihdr_end:
+        return None
+    chunks = b"".join(_png_chunk(chunk[0], chunk[1]) for chunk in metadata.chunks)
+    return data[:ihdr_end] + chunks + data[ihdr_end:]
+
+
+def inject_jpeg_exif(data: bytes, exif: bytes) -> bytes | None:
+    """
+    Insert an EXIF APP1 segment into encoded JPEG bytes, replacing any existing one.
+
+    The segment goes after SOI and a leading JFIF APP0. Returns None if the
+    EXIF does not fit in one segment or the markers before the image data
+    cannot be parsed.
+    """
+    if len(exif) > JPEG_MAX_SEGMENT or not data.startswith(b"\xff\xd8"):
+        return None
+
+    # Walk the marker segments up to start-of-scan, dropping existing EXIF
+    pos = 2
+    app0 = b""
+    segments = []
+    while True:
+        if pos + 4 > len(data) or data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xDA:
+            break
+        end = pos + 2 + struct.unpack(">H", data[pos + 2 : pos + 4])[0]
+        segment = data[pos:end]
+        if marker == 0xE0 and pos == 2:
+            app0 = segment
+        elif not (marker == 0xE1 and segment[4:10] == b"Exif\x00\x00"):
+            segments.append(segment)
+        pos = end
+
+    app1 = b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    return data[:2] + app0 + app1 + b"".join(segments) + data[pos:]
@@ -0,0 +1,24 @@
+"""
+API base URLs for LLM and imagen providers.
+
+Each URL can be overridden with an environment variable, e.g. to point the
+nodes at a local mock server for benchmarking:
+
+- LUMI_OPENROUTER_BASE_URL (default: https://openrouter.ai/api/v1)
+- LUMI_GOOGLE_BASE_URL (default: https://generativelanguage.googleapis.com/v1beta)
+"""
+
+import os
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+GOOGLE_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+def get_openrouter_base_url() -> str:
+    """Get the OpenRouter API base URL, honoring LUMI_OPENROUTER_BASE_URL."""
+    return (os.environ.get("LUMI_OPENROUTER_BASE_URL") or OPENROUTER_BASE_URL).rstrip("/")
+
+
+def get_google_base_url() -> str:
+    """Get the Google AI Studio API base URL, honoring LUMI_GOOGLE_BASE_URL."""
+    return (os.environ.get("LUMI_GOOGLE_BASE_URL") or GOOGLE_BASE_URL).rstrip("/")
@@ -5,17 +5,31 @@ Contains:
 - LumiGeminiImagenConfig: Configuration for Gemini imagen models
 - LumiOpenRouterImagenProvider: Provider for OpenRouter imagen API
 - LumiLLMImagenProcessor: Main processor that generates images
+
+torch, numpy, PIL and requests are imported when a node runs, not at import.
 """
 
+from __future__ import annotations
+
 import base64
+import logging
 import os
 from io import BytesIO
-from typing import Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from .llm_endpoints import get_google_base_url, get_openrouter_base_url
+from .llm_inference import build_chat_messages, get_cached_tokens
+from .llm_metrics import metrics
+from .manifest import manifest
+from .seeding import image_api_seed
 
-import numpy as np
-import requests
-import torch
-from PIL import Image
+if TYPE_CHECKING:
+    import torch
+
+# Tensor dtypes for decoded images. float32 is the ComfyUI IMAGE standard;
+# float16 halves memory and uint8 quarters it (Lumi Save Image accepts uint8
+# directly, most other nodes expect float)
+OUTPUT_DTYPES = ["float32", "float16", "uint8"]
 
 # Hardcoded list of Gemini imagen models available on OpenRouter
 IMAGEN_MODELS_OPENROUTER = [
@@ -157,7 +171,16 @@ class LumiOpenRouterImagenProvider:
                         "tooltip": "Select the imagen model to use",
                     },
                 ),
-            }
+            },
+            "optional": {
+                "cache_instructions": (
+                    "BOOLEAN",
+                    {
+                        "default": True,
+                        "tooltip": "Mark the instructions as a cacheable prompt prefix for providers that support prompt caching",
+                    },
+                ),
+            },
         }
 
     RETURN_TYPES = ("IMAGEN_PROVIDER",)
@@ -170,7 +193,9 @@ class LumiOpenRouterImagenProvider:
         "The API key must be set as an environment variable."
     )
 
-    def create_provider(self, env_key: str, model: str) -> Tuple[Dict[str, Any]]:
+    def create_provider(
+        self, env_key: str, model: str, cache_instructions: bool = True
+    ) -> Tuple[Dict[str, Any]]:
         """Create OpenRouter imagen provider configuration."""
         # Get API key from environment
         api_key = os.getenv(env_key.strip())
@@ -191,6 +216,7 @@ class LumiOpenRouterImagenProvider:
             "model_id": model,
             "model_family": model_info.get("family", "gemini"),
             "max_resolution": model_info.get("max_resolution", "1K"),
+            "cache_instructions": cache_instructions,
             "env_key": env_key,
         }
         return (provider_config,)
@@ -305,7 +331,9 @@ class LumiLLMImagenProcessor:
                         "default": 0,
                         "min": 0,
                         "max": 0xFFFFFFFFFFFFFFFF,
-                        "tooltip": "Seed for generation (forces reprocessing)",
+                        "tooltip": "Seed for generation (forces reprocessing). The API takes int32 seeds: "
+                        "seeds up to 2^32 - 1 are sent as seed % (2^31 - 1) as before, larger seeds "
+                        "are XOR-folded into that range",
                     },
                 ),
             },
@@ -318,18 +346,27 @@ class LumiLLMImagenProcessor:
                         "tooltip": "System instructions for the model (optional)",
                     },
                 ),
+                "output_dtype": (
+                    OUTPUT_DTYPES,
+                    {
+                        "default": "float32",
+                        "tooltip": "Tensor type of the decoded image. float16/uint8 use less "
+                        "memory; uint8 is only understood by Lumi Save Image and nodes that "
+                        "convert it themselves",
+                    },
+                ),
             },
         }
 
-    RETURN_TYPES = ("IMAGE", "STRING")
-    RETURN_NAMES = ("images", "text")
+    RETURN_TYPES = ("IMAGE", "STRING", "LUMI_IMAGE_BYTES")
+    RETURN_NAMES = ("images", "text", "image_bytes")
     FUNCTION = "generate_images"
     CATEGORY = "Lumi/LLM"
 
     DESCRIPTION = (
         "Generates images using Gemini imagen models. "
         "Supports both Google AI Studio (direct) and OpenRouter providers. "
-        "Outputs images as a batch tensor and optional text response."
+        "Outputs images as a batch tensor, optional text response and the original encoded bytes."
     )
 
     def generate_images(
@@ -339,7 +376,8 @@ class LumiLLMImagenProcessor:
         prompt: str,
         seed: int,
         instructions: str = "",
-    ) -> Tuple[torch.Tensor, str]:
+        output_dtype: str = "float32",
+    ) -> Tuple[torch.Tensor, str, List[Dict[str, Any]]]:
         """Generate images using the configured provider and settings."""
         # Validate compatibility
         if provider.get("model_family") != config.get("config_type"):
@@ -351,12 +389,26 @@ class LumiLLMImagenProcessor:
         # Route to appropriate provider
         provider_type = provider.get("provider_type", "")
         if provider_type == "google_imagen":
-            return self._generate_google(provider, config, prompt, seed, instructions)
+            result = self._generate_google(
+                provider, config, prompt, seed, instructions, output_dtype
+            )
         elif provider_type == "openrouter_imagen":
-            return self._generate_openrouter(provider, config, prompt, seed, instructions)
+            result = self._generate_openrouter(
+                provider, config, prompt, seed, instructions, output_dtype
+            )
         else:
             raise ValueError(f"Unknown provider type: {provider_type}")
 
+        manifest.record(
+            "imagen",
+            provider=provider_type,
+            model=provider.get("model_id"),
+            seed=seed,
+            prompt=prompt,
+            text=result[1],
+        )
+        return result
+
     def _generate_google(
         self,
         provider: Dict[str, Any],
@@ -364,9 +416,13 @@ class LumiLLMImagenProcessor:
         prompt: str,
         seed: int,
         instructions: str,
-    ) -> Tuple[torch.Tensor, str]:
+        output_dtype: str = "float32",
+    ) -> Tuple[torch.Tensor, str, List[Dict[str, Any]]]:
         """Generate images via direct Google AI Studio API."""
-        # Build prompt text
+        import requests
+
+        # Build prompt text. Instructions lead the prompt so the shared prefix is
+        # eligible for Gemini's implicit prompt caching across a batch.
         full_prompt = prompt.strip()
         if instructions.strip():
             full_prompt = f"{instructions.strip()}\n\n{full_prompt}"
@@ -398,14 +454,14 @@ class LumiLLMImagenProcessor:
         if effective_size != "1K":
             payload["generationConfig"]["imageConfig"]["imageSize"] = effective_size
 
-        # Add seed (capped to INT32 max)
+        # Add seed (mapped into the INT32 range)
         if seed is not None:
-            payload["generationConfig"]["seed"] = seed % 2147483647
+            payload["generationConfig"]["seed"] = image_api_seed(seed)
 
         # Build URL with model and API key
         model_id = provider["model_id"]
         api_key = provider["api_key"]
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_id}:generateContent"
+        url = f"{get_google_base_url()}/models/{model_id}:generateContent"
 
         headers = {
             "x-goog-api-key": api_key,
@@ -413,22 +469,31 @@ class LumiLLMImagenProcessor:
         }
 
         # Make API request
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=120)
-            if not response.ok:
-                try:
-                    error_body = response.json()
-                    error_msg = (
-                        error_body.get("error", {}).get("message")
-                        or error_body.get("message")
-                        or str(error_body)
-                    )
-                except Exception:
-                    error_msg = response.text
-                raise RuntimeError(f"Google API error ({response.status_code}): {error_msg}")
-            result = response.json()
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"Google API request failed: {str(e)}") from e
+        with metrics.track("google", model_id) as call:
+            try:
+                response = requests.post(url, headers=headers, json=payload, timeout=120)
+                call.record_response(response)
+                if not response.ok:
+                    try:
+                        error_body = response.json()
+                        error_msg = (
+                            error_body.get("error", {}).get("message")
+                            or error_body.get("message")
+                            or str(error_body)
+                        )
+                    except Exception:
+                        error_msg = response.text
+                    raise RuntimeError(f"Google API error ({response.status_code}): {error_msg}")
+                result = response.json()
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"Google API request failed: {str(e)}") from e
+
+            usage = result.get("usageMetadata") or {}
+            call.record_usage(
+                prompt_tokens=usage.get("promptTokenCount", 0),
+                completion_tokens=usage.get("candidatesTokenCount", 0),
+                cached_tokens=get_cached_tokens(usage),
+            )
 
         # Extract response - Google format has parts with text and inlineData
         try:
@@ -438,20 +503,29 @@ class LumiLLMImagenProcessor:
 
         text_response = ""
         image_data = None
+        mime_type = "image/png"
 
         for part in parts:
             if "text" in part:
                 text_response = part["text"]
             elif "inlineData" in part:
                 image_data = part["inlineData"]["data"]
+                mime_type = part["inlineData"].get("mimeType", mime_type)
 
         if not image_data:
             raise ValueError("No image returned from Google API")
 
-        # Convert to tensor
-        tensor = self._decode_image(image_data)
+        logging.info(
+            f"Imagen generation completed using {model_id} "
+            f"(prompt tokens: {usage.get('promptTokenCount', 0)}, "
+            f"cached: {get_cached_tokens(usage)})"
+        )
+
+        # Convert to tensor, keeping the encoded bytes
+        encoded = self._parse_image_data(image_data, mime_type)
+        tensor = self._decode_image(encoded["data"], output_dtype)
 
-        return (tensor, text_response)
+        return (tensor, text_response, [encoded])
 
     def _generate_openrouter(
         self,
@@ -460,13 +534,15 @@ class LumiLLMImagenProcessor:
         prompt: str,
         seed: int,
         instructions: str,
-    ) -> Tuple[torch.Tensor, str]:
+        output_dtype: str = "float32",
+    ) -> Tuple[torch.Tensor, str, List[Dict[str, Any]]]:
         """Generate images via OpenRouter API."""
+        import requests
+
         # Build messages
-        messages = []
-        if instructions.strip():
-            messages.append({"role": "system", "content": instructions.strip()})
-        messages.append({"role": "user", "content": prompt.strip()})
+        messages = build_chat_messages(
+            instructions, prompt, provider.get("cache_instructions", False)
+        )
 
         # Build payload
         payload = {
@@ -481,9 +557,9 @@ class LumiLLMImagenProcessor:
             },
         }
 
-        # Add seed (capped to INT32 max for Google API compatibility)
+        # Add seed (mapped into the INT32 range for Google API compatibility)
         if seed is not None:
-            payload["seed"] = seed % 2147483647
+            payload["seed"] = image_api_seed(seed)
 
         headers = {
             "Authorization": f"Bearer {provider['api_key']}",
@@ -493,27 +569,38 @@ class LumiLLMImagenProcessor:
         }
 
         # Make API request
-        try:
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=180,
-            )
-            if not response.ok:
-                try:
-                    error_body = response.json()
-                    error_msg = (
-                        error_body.get("error", {}).get("message")
-                        or error_body.get("message")
-                        or str(error_body)
+        with metrics.track("openrouter", provider["model_id"]) as call:
+            try:
+                response = requests.post(
+                    f"{get_openrouter_base_url()}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=180,
+                )
+                call.record_response(response)
+                if not response.ok:
+                    try:
+                        error_body = response.json()
+                        error_msg = (
+                            error_body.get("error", {}).get("message")
+                            or error_body.get("message")
+                            or str(error_body)
+                        )
+                    except Exception:
+                        error_msg = response.text
+                    raise RuntimeError(
+                        f"OpenRouter API error ({response.status_code}): {error_msg}"
                     )
-                except Exception:
-                    error_msg = response.text
-                raise RuntimeError(f"OpenRouter API error ({response.status_code}): {error_msg}")
-            result = response.json()
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"OpenRouter API request failed: {str(e)}") from e
+                result = response.json()
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"OpenRouter API request failed: {str(e)}") from e
+
+            usage = result.get("usage") or {}
+            call.record_usage(
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                cached_tokens=get_cached_tokens(usage),
+            )
 
         # Extract response
         try:
@@ -526,22 +613,49 @@ class LumiLLMImagenProcessor:
         if not images_data:
             raise ValueError("No images returned from OpenRouter API")
 
+        logging.info(
+            f"Imagen generation completed using {provider['model_id']} "
+            f"(prompt tokens: {usage.get('prompt_tokens', 0)}, "
+            f"cached: {get_cached_tokens(usage)})"
+        )
+
         # Get first image URL
         first_image = images_data[0]
         url = first_image.get("image_url", {}).get("url", "")
         if not url:
             raise ValueError("No valid image URL in response")
 
-        # Convert to tensor
-        tensor = self._decode_image(url)
+        # Convert to tensor, keeping the encoded bytes
+        encoded = self._parse_image_data(url)
+        tensor = self._decode_image(encoded["data"], output_dtype)
+
+        return (tensor, text_response, [encoded])
+
+    def _parse_image_data(self, url: str, mime_type: str = "image/png") -> Dict[str, Any]:
+        """
+        Decode a base64 data URL (or bare base64) to {"data": bytes, "mime_type": str}.
+
+        The media type of a data URL takes precedence over mime_type.
+        """
+        if "," in url:
+            header, b64_data = url.split(",", 1)
+            if header.startswith("data:"):
+                mime_type = header[5:].split(";")[0] or mime_type
+        else:
+            b64_data = url
+        return {"data": base64.b64decode(b64_data), "mime_type": mime_type}
 
-        return (tensor, text_response)
+    def _decode_image(self, image_bytes: bytes, output_dtype: str = "float32") -> torch.Tensor:
+        """Decode encoded image bytes to a (1, H, W, C) ComfyUI image tensor of output_dtype."""
+        import numpy as np
+        import torch
+        from PIL import Image
 
-    def _decode_image(self, url: str) -> torch.Tensor:
-        """Convert base64 data URL to ComfyUI image tensor."""
-        # Strip data URL prefix if present
-        b64_data = url.split(",")[1] if "," in url else url
-        image_bytes = base64.b64decode(b64_data)
         pil_image = Image.open(BytesIO(image_bytes)).convert("RGB")
-        np_image = np.array(pil_image).astype(np.float32) / 255.0
-        return torch.from_numpy(np_image).unsqueeze(0)  # (1, H, W, C)
+        pixels = torch.from_numpy(np.array(pil_image))
+        if output_dtype == "uint8":
+            return pixels.unsqueeze(0)
+        # Cast straight to the target dtype and scale in place: no float32
+        # intermediate for float16, one allocation for float32
+        dtype = torch.float16 if output_dtype == "float16" else torch.float32
+        return pixels.to(dtype).div_(255.0).unsqueeze(0)
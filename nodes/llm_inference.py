@@ -4,19 +4,67 @@ Base inference abstraction for LLM providers.
 
 import json
 from abc import ABC, abstractmethod
-from typing import Optional
-
-import requests
+from typing import Any, Dict, List, Optional
+
+from .llm_endpoints import get_openrouter_base_url
+from .llm_metrics import metrics
+from .seeding import CHAT_API_SEED_BITS, fold_seed
+
+
+def build_chat_messages(
+    instructions: str, prompt: str, cache_instructions: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Build OpenAI-style chat messages from instructions and prompt.
+
+    When cache_instructions is set, the system message is sent as a content part
+    carrying a cache_control breakpoint so providers that support prompt caching
+    (Anthropic, Gemini via OpenRouter) can reuse the instruction prefix across calls.
+    Providers without explicit caching ignore the marker.
+    """
+    messages: List[Dict[str, Any]] = []
+    instructions = instructions.strip()
+    if instructions:
+        if cache_instructions:
+            content: Any = [
+                {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}}
+            ]
+        else:
+            content = instructions
+        messages.append({"role": "system", "content": content})
+    messages.append({"role": "user", "content": prompt.strip()})
+    return messages
+
+
+def get_cached_tokens(usage: Optional[Dict[str, Any]]) -> int:
+    """Read the cached prompt token count from an OpenRouter or Google usage block."""
+    if not usage:
+        return 0
+    # OpenRouter: usage.prompt_tokens_details.cached_tokens
+    details = usage.get("prompt_tokens_details") or {}
+    # Google: usageMetadata.cachedContentTokenCount
+    cached = details.get("cached_tokens") or usage.get("cachedContentTokenCount") or 0
+    return int(cached)
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
-    def __init__(self, api_key: str, model_id: str, max_tokens: int = 1000, top_p: float = 1.0):
+    def __init__(
+        self,
+        api_key: str,
+        model_id: str,
+        max_tokens: int = 1000,
+        top_p: float = 1.0,
+        cache_instructions: bool = False,
+    ):
         self.api_key = api_key
         self.model_id = model_id
         self.max_tokens = max_tokens
         self.top_p = top_p
+        self.cache_instructions = cache_instructions
+        # Usage block from the most recent response (tokens, cached tokens)
+        self.last_usage: Dict[str, Any] = {}
 
     @abstractmethod
     def generate(self, instructions: str, prompt: str, seed: Optional[int] = None) -> str:
@@ -32,9 +80,16 @@ class LLMProvider(ABC):
 class OpenRouterProvider(LLMProvider):
     """OpenRouter LLM provider implementation."""
 
-    def __init__(self, api_key: str, model_id: str, max_tokens: int = 1000, top_p: float = 1.0):
-        super().__init__(api_key, model_id, max_tokens, top_p)
-        self.base_url = "https://openrouter.ai/api/v1"
+    def __init__(
+        self,
+        api_key: str,
+        model_id: str,
+        max_tokens: int = 1000,
+        top_p: float = 1.0,
+        cache_instructions: bool = False,
+    ):
+        super().__init__(api_key, model_id, max_tokens, top_p, cache_instructions)
+        self.base_url = get_openrouter_base_url()
 
     def validate_config(self) -> bool:
         """Validate OpenRouter configuration."""
@@ -46,14 +101,13 @@ class OpenRouterProvider(LLMProvider):
 
     def generate(self, instructions: str, prompt: str, seed: Optional[int] = None) -> str:
         """Generate text using OpenRouter API."""
+        import requests
+
         if not self.validate_config():
             raise ValueError("Invalid OpenRouter configuration")
 
         # Combine instructions and prompt
-        messages = []
-        if instructions.strip():
-            messages.append({"role": "system", "content": instructions.strip()})
-        messages.append({"role": "user", "content": prompt.strip()})
+        messages = build_chat_messages(instructions, prompt, self.cache_instructions)
 
         # Prepare request payload
         payload = {
@@ -65,7 +119,7 @@ class OpenRouterProvider(LLMProvider):
 
         # Add seed if provided and supported
         if seed is not None:
-            payload["seed"] = seed
+            payload["seed"] = fold_seed(seed, CHAT_API_SEED_BITS)
 
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -75,17 +129,25 @@ class OpenRouterProvider(LLMProvider):
         }
 
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions", headers=headers, json=payload, timeout=60
-            )
-            response.raise_for_status()
-
-            result = response.json()
-
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
-            else:
-                raise ValueError("No response content received from OpenRouter")
+            with metrics.track("openrouter", self.model_id) as call:
+                response = requests.post(
+                    f"{self.base_url}/chat/completions", headers=headers, json=payload, timeout=60
+                )
+                call.record_response(response)
+                response.raise_for_status()
+
+                result = response.json()
+                self.last_usage = result.get("usage") or {}
+                call.record_usage(
+                    prompt_tokens=self.last_usage.get("prompt_tokens", 0),
+                    completion_tokens=self.last_usage.get("completion_tokens", 0),
+                    cached_tokens=get_cached_tokens(self.last_usage),
+                )
+
+                if "choices" in result and len(result["choices"]) > 0:
+                    return result["choices"][0]["message"]["content"]
+                else:
+                    raise ValueError("No response content received from OpenRouter")
 
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"OpenRouter API request failed: {str(e)}") from e
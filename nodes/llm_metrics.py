@@ -0,0 +1,245 @@
+"""
+Usage, latency and cost metrics for LLM and imagen API calls.
+
+Exposed through the ComfyUI server:
+- GET /lumi/metrics              JSON snapshot per provider/model
+- GET /lumi/metrics/prometheus   Prometheus text format (set LUMI_METRICS_PROMETHEUS=1)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .llm_models import model_cache
+
+try:
+    from server import PromptServer
+
+    HAS_SERVER = True
+except ImportError:
+    HAS_SERVER = False
+
+if HAS_SERVER:
+    from aiohttp import web
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 180.0)
+
+# Number of recent latencies kept per model for percentile estimates
+LATENCY_WINDOW = 1024
+
+
+def estimate_cost(
+    provider: str, model_id: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int
+) -> float:
+    """Estimate the USD cost of a call from the cached OpenRouter pricing fields."""
+    pricing = model_cache.get_pricing(model_id)
+    if not pricing and provider == "google":
+        # Direct Google model IDs are listed on OpenRouter under the google/ prefix
+        pricing = model_cache.get_pricing(f"google/{model_id}")
+    if not pricing:
+        return 0.0
+
+    prompt_price = pricing.get("prompt", 0.0)
+    cache_price = pricing.get("input_cache_read", prompt_price)
+    cached_tokens = min(cached_tokens, prompt_tokens)
+    return (
+        (prompt_tokens - cached_tokens) * prompt_price
+        + cached_tokens * cache_price
+        + completion_tokens * pricing.get("completion", 0.0)
+        + pricing.get("request", 0.0)
+    )
+
+
+class CallRecord:
+    """Measurements collected for a single API call inside MetricsRegistry.track()."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def record_response(self, response: Any) -> None:
+        """Record request and response body sizes from a requests.Response."""
+        request = getattr(response, "request", None)
+        body = getattr(request, "body", None) or b""
+        self.bytes_sent += len(body)
+        self.bytes_received += len(response.content or b"")
+
+    def record_usage(
+        self, prompt_tokens: int = 0, completion_tokens: int = 0, cached_tokens: int = 0
+    ) -> None:
+        """Record token usage reported by the provider."""
+        self.prompt_tokens += int(prompt_tokens or 0)
+        self.completion_tokens += int(completion_tokens or 0)
+        self.cached_tokens += int(cached_tokens or 0)
+
+
+class ModelStats:
+    """Counters and latency distribution for one provider/model pair."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.cost = 0.0
+        self.latency_sum = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, record: CallRecord, seconds: float, error: bool, cost: float) -> None:
+        self.requests += 1
+        self.errors += int(error)
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_tokens += record.cached_tokens
+        self.bytes_sent += record.bytes_sent
+        self.bytes_received += record.bytes_received
+        self.cost += cost
+        self.latency_sum += seconds
+        self.latencies.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile over the recent latency window."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "cost_usd": self.cost,
+            "latency": {
+                "mean": self.latency_sum / self.requests if self.requests else 0.0,
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99),
+            },
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of per-model API call metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], ModelStats] = {}
+
+    @contextmanager
+    def track(self, provider: str, model_id: str) -> Iterator[CallRecord]:
+        """Time an API call and record its usage; exceptions are counted as errors."""
+        record = CallRecord()
+        error = False
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            cost = estimate_cost(
+                provider,
+                model_id,
+                record.prompt_tokens,
+                record.completion_tokens,
+                record.cached_tokens,
+            )
+            with self._lock:
+                stats = self._stats.setdefault((provider, model_id), ModelStats())
+                stats.add(record, seconds, error, cost)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            models = [
+                {"provider": provider, "model": model_id, **stats.to_dict()}
+                for (provider, model_id), stats in sorted(self._stats.items())
+            ]
+        return {"models": models}
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        counters = [
+            ("lumi_llm_requests_total", "API calls made", "requests"),
+            ("lumi_llm_errors_total", "API calls that raised an error", "errors"),
+            ("lumi_llm_prompt_tokens_total", "Prompt tokens reported", "prompt_tokens"),
+            ("lumi_llm_completion_tokens_total", "Completion tokens reported", "completion_tokens"),
+            ("lumi_llm_cached_tokens_total", "Prompt tokens served from cache", "cached_tokens"),
+            ("lumi_llm_bytes_sent_total", "Request body bytes sent", "bytes_sent"),
+            ("lumi_llm_bytes_received_total", "Response body bytes received", "bytes_received"),
+            ("lumi_llm_cost_usd_total", "Estimated cost in USD", "cost"),
+        ]
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines: List[str] = []
+            for name, help_text, attr in counters:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (provider, model_id), stats in items:
+                    labels = _labels(provider, model_id)
+                    lines.append(f"{name}{{{labels}}} {getattr(stats, attr)}")
+
+            name = "lumi_llm_request_duration_seconds"
+            lines.append(f"# HELP {name} API call latency")
+            lines.append(f"# TYPE {name} histogram")
+            for (provider, model_id), stats in items:
+                labels = _labels(provider, model_id)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts[:-1], strict=True):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {stats.requests}')
+                lines.append(f"{name}_sum{{{labels}}} {stats.latency_sum}")
+                lines.append(f"{name}_count{{{labels}}} {stats.requests}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(provider: str, model_id: str) -> str:
+    model_id = model_id.replace("\\", "\\\\").replace('"', '\\"')
+    return f'provider="{provider}",model="{model_id}"'
+
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+
+if HAS_SERVER:
+
+    @PromptServer.instance.routes.get("/lumi/metrics")
+    async def get_metrics(request):
+        return web.json_response(metrics.snapshot())
+
+    if os.environ.get("LUMI_METRICS_PROMETHEUS", "").lower() in ("1", "true", "yes"):
+
+        @PromptServer.instance.routes.get("/lumi/metrics/prometheus")
+        async def get_metrics_prometheus(request):
+            return web.Response(text=metrics.to_prometheus(), content_type="text/plain")
@@ -5,7 +5,8 @@ Model caching and management for LLM providers.
 import logging
 from typing import Dict, List, Optional
 
-import requests
+from .llm_endpoints import get_openrouter_base_url
+from .startup_profile import startup_profile
 
 
 class ModelCache:
@@ -20,13 +21,16 @@ class ModelCache:
         if self._initialized:
             return
 
-        self._fetch_openrouter_models()
+        with startup_profile.phase("OpenRouter model list fetch", kind="io"):
+            self._fetch_openrouter_models()
         self._initialized = True
 
     def _fetch_openrouter_models(self):
         """Fetch models from OpenRouter API with fallback."""
+        import requests
+
         try:
-            response = requests.get("https://openrouter.ai/api/v1/models", timeout=10)
+            response = requests.get(f"{get_openrouter_base_url()}/models", timeout=10)
             response.raise_for_status()
 
             models_data = response.json()
@@ -84,6 +88,26 @@ class ModelCache:
                 return model
         return None
 
+    def get_pricing(self, model_id: str, provider: str = "openrouter") -> Dict[str, float]:
+        """
+        Get per-unit pricing for a model as floats (USD per token/request).
+
+        Does not trigger a fetch; returns an empty dict if the cache is not yet
+        initialized or the model is unknown.
+        """
+        if not self._initialized:
+            return {}
+        for model in self._models.get(provider, []):
+            if model.get("id") == model_id:
+                pricing = {}
+                for key, value in (model.get("pricing") or {}).items():
+                    try:
+                        pricing[key] = float(value)
+                    except (TypeError, ValueError):
+                        continue
+                return pricing
+        return {}
+
     def get_model_choices(self, provider: str = "openrouter") -> List[str]:
         """Get list of model IDs for UI dropdown."""
         models = self.get_models(provider)
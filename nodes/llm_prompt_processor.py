@@ -5,7 +5,8 @@ LLM Prompt Processor node for stateless text generation.
 import logging
 from typing import Any, Dict, Tuple
 
-from .llm_inference import create_provider
+from .llm_inference import create_provider, get_cached_tokens
+from .manifest import manifest
 
 
 class LumiLLMPromptProcessor:
@@ -77,6 +78,7 @@ class LumiLLMPromptProcessor:
             model_id = provider.get("model_id")
             max_tokens = provider.get("max_tokens", 1000)
             top_p = provider.get("top_p", 1.0)
+            cache_instructions = provider.get("cache_instructions", False)
 
             if not api_key:
                 env_key = provider.get("env_key", "OPENROUTER_API_KEY")
@@ -95,6 +97,7 @@ class LumiLLMPromptProcessor:
                 model_id=model_id,
                 max_tokens=max_tokens,
                 top_p=top_p,
+                cache_instructions=cache_instructions,
             )
 
             # Generate text
@@ -105,7 +108,20 @@ class LumiLLMPromptProcessor:
             # Log successful generation (without sensitive data)
             model_info = provider.get("model_info", {})
             model_name = model_info.get("name", model_id)
-            logging.info(f"LLM generation completed using {model_name}")
+            usage = llm_provider.last_usage
+            logging.info(
+                f"LLM generation completed using {model_name} "
+                f"(prompt tokens: {usage.get('prompt_tokens', 0)}, "
+                f"cached: {get_cached_tokens(usage)})"
+            )
+            manifest.record(
+                "llm_prompt",
+                provider=provider_type,
+                model=model_id,
+                seed=seed,
+                prompt=prompt,
+                text=result,
+            )
 
             return (result,)
 
@@ -0,0 +1,174 @@
+"""
+Append-only job manifest of generated prompts, seeds and saved files.
+
+Set LUMI_MANIFEST to a file path to enable it: a .sqlite or .db path writes a
+SQLite table (manifest: id, time, prompt_id, event, data), any other path JSON
+Lines. Wildcard expansions, LLM prompt rewrites, imagen calls and saved images
+each append one record tagged with the ComfyUI prompt_id of the run, so saved
+files can be traced back to the expansions and seeds that produced them
+without opening the images.
+
+Records are queued and written by a background thread in batches (one write
+and commit per batch), so nodes never wait on the log.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from server import PromptServer
+
+    HAS_SERVER = True
+except ImportError:
+    HAS_SERVER = False
+
+# Records waiting for the writer thread; further records are dropped
+MAX_QUEUED_RECORDS = 10000
+
+# Records written per batch, and how long the writer waits to fill one
+BATCH_SIZE = 256
+BATCH_INTERVAL = 0.5
+
+# Prompt inputs reported as seeds for saved images
+SEED_INPUTS = ("seed", "noise_seed")
+
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+
+def current_prompt_id() -> Optional[str]:
+    """ID of the prompt ComfyUI is executing, if running inside ComfyUI."""
+    if not HAS_SERVER:
+        return None
+    return getattr(PromptServer.instance, "last_prompt_id", None)
+
+
+def prompt_seeds(prompt: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Literal seed inputs of an API-format prompt, keyed by node id."""
+    seeds = {}
+    for node_id, node in (prompt or {}).items():
+        inputs = node.get("inputs", {}) if isinstance(node, dict) else {}
+        for name in SEED_INPUTS:
+            value = inputs.get(name)
+            if isinstance(value, int):
+                seeds[str(node_id)] = value
+                break
+    return seeds
+
+
+class _JsonlSink:
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+
+
+class _SqliteSink:
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "id INTEGER PRIMARY KEY, time REAL, prompt_id TEXT, event TEXT, data TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS manifest_prompt_id ON manifest (prompt_id)")
+        self._db.commit()
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        rows = []
+        for record in records:
+            data = {k: v for k, v in record.items() if k not in ("time", "prompt_id", "event")}
+            rows.append((record["time"], record["prompt_id"], record["event"], json.dumps(data)))
+        self._db.executemany(
+            "INSERT INTO manifest (time, prompt_id, event, data) VALUES (?, ?, ?, ?)", rows
+        )
+        self._db.commit()
+
+
+class ManifestWriter:
+    """Queues manifest records and writes them from one background thread."""
+
+    def __init__(self, path: str, max_queued: int = MAX_QUEUED_RECORDS):
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(max_queued)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def record(self, event: str, **fields) -> None:
+        """Queue one record; never blocks, drops the record if the queue is full."""
+        if not self.path:
+            return
+        entry = {"time": time.time(), "prompt_id": current_prompt_id(), "event": event, **fields}
+        self._start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                logging.warning("Lumi manifest queue is full, dropping records")
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lumi-manifest", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _open_sink(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.path.lower().endswith(SQLITE_EXTENSIONS):
+            return _SqliteSink(self.path)
+        return _JsonlSink(self.path)
+
+    def _run(self) -> None:
+        try:
+            sink = self._open_sink()
+        except Exception as e:
+            logging.error(f"Lumi manifest disabled, cannot open {self.path}: {e}")
+            sink = None
+
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_INTERVAL
+            while len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                if sink is not None:
+                    sink.write(batch)
+            except Exception as e:
+                logging.error(f"Lumi manifest write failed, {len(batch)} records lost: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+# Global manifest writer (disabled unless LUMI_MANIFEST is set)
+manifest = ManifestWriter(os.environ.get("LUMI_MANIFEST", ""))
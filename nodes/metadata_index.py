@@ -0,0 +1,310 @@
+"""
+Searchable SQLite index of the workflow metadata in saved PNGs.
+
+Only the PNG text chunks are read (tEXt/zTXt/iTXt before the first IDAT), never
+the pixels. From the "prompt" chunk each image gets its prompt texts, seeds
+and model names, so images can be looked up by any of them:
+
+    python -m nodes.metadata_index ComfyUI/output --search "red fox"
+    python -m nodes.metadata_index ComfyUI/output --seed 1234 --no-update
+
+Rescans are incremental: files whose size and mtime match the index are
+skipped, new or changed ones are parsed in parallel processes and removed
+files are dropped. With LUMI_INDEX set to an index path, Lumi Save Image adds
+its PNGs to that index as they are saved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .manifest import prompt_seeds
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+TEXT_CHUNKS = (b"tEXt", b"zTXt", b"iTXt")
+
+# Prompt inputs indexed as searchable text and as model names
+TEXT_INPUTS = ("text", "text_g", "text_l", "prompt", "wildcard_text", "populated_text")
+MODEL_INPUTS = ("ckpt_name", "unet_name", "model_name", "model", "model_id", "lora_name")
+
+# Files parsed per worker task, and fewer files than this are parsed in-process
+PARSE_CHUNKSIZE = 32
+PARALLEL_MIN_FILES = 64
+
+# Rows written per transaction during a rescan
+COMMIT_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, text TEXT, seeds TEXT, models TEXT
+);
+CREATE TABLE IF NOT EXISTS image_values (path TEXT, kind TEXT, value TEXT);
+CREATE INDEX IF NOT EXISTS image_values_lookup ON image_values (kind, value);
+CREATE INDEX IF NOT EXISTS image_values_path ON image_values (path);
+"""
+
+
+def read_png_text(path: str, keys: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    Text chunks of a PNG file, optionally only the given keys.
+
+    Stops at the first IDAT chunk, so image data is never read. Returns an
+    empty dict for files that are not PNGs.
+    """
+    wanted = set(keys) if keys is not None else None
+    texts: Dict[str, str] = {}
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            return texts
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, chunk_type = struct.unpack(">I4s", header)
+            if chunk_type in (b"IDAT", b"IEND"):
+                break
+            if chunk_type not in TEXT_CHUNKS:
+                f.seek(length + 4, os.SEEK_CUR)
+                continue
+            data = f.read(length)
+            f.seek(4, os.SEEK_CUR)
+            key, _, rest = data.partition(b"\0")
+            key = key.decode("latin-1")
+            if wanted is not None and key not in wanted:
+                continue
+            try:
+                if chunk_type == b"tEXt":
+                    texts[key] = rest.decode("latin-1")
+                elif chunk_type == b"zTXt":
+                    texts[key] = zlib.decompress(rest[1:]).decode("latin-1")
+                else:
+                    compressed = rest[0]
+                    # Skip compression method, language tag and translated keyword
+                    text = rest[2:].split(b"\0", 2)[2]
+                    texts[key] = (zlib.decompress(text) if compressed else text).decode("utf-8")
+            except (zlib.error, IndexError, UnicodeDecodeError):
+                continue
+    return texts
+
+
+def extract_fields(prompt: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, int], List[str]]:
+    """(prompt texts joined by newlines, seeds by node id, model names) of an API prompt."""
+    texts: List[str] = []
+    models: List[str] = []
+    for node in (prompt or {}).values():
+        inputs = node.get("inputs", {}) if isinstance(node, dict) else {}
+        for name in TEXT_INPUTS:
+            value = inputs.get(name)
+            if isinstance(value, str) and value:
+                texts.append(value)
+        for name in MODEL_INPUTS:
+            value = inputs.get(name)
+            if isinstance(value, str) and value and value not in models:
+                models.append(value)
+    return "\n".join(texts), prompt_seeds(prompt), models
+
+
+def _image_row(path: str, stat: os.stat_result, fields: tuple) -> tuple:
+    text, seeds, models = fields
+    return (path, stat.st_mtime_ns, stat.st_size, text, json.dumps(seeds), json.dumps(models))
+
+
+def _parse_file(path: str) -> Optional[tuple]:
+    """Index row of one PNG, or None if it cannot be read (runs in worker processes)."""
+    try:
+        stat = os.stat(path)
+        prompt_text = read_png_text(path, ["prompt"]).get("prompt")
+        prompt = json.loads(prompt_text) if prompt_text else None
+    except (OSError, ValueError):
+        return None
+    return _image_row(path, stat, extract_fields(prompt if isinstance(prompt, dict) else None))
+
+
+class MetadataIndex:
+    """SQLite index of saved PNGs, keyed by absolute path."""
+
+    def __init__(self, index_path: str):
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(index_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def _write_rows(self, rows: List[tuple]) -> None:
+        paths = [(row[0],) for row in rows]
+        self.db.executemany("DELETE FROM image_values WHERE path = ?", paths)
+        self.db.executemany("INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?)", rows)
+        values = []
+        for path, _, _, _, seeds, models in rows:
+            values.extend((path, "seed", str(seed)) for seed in json.loads(seeds).values())
+            values.extend((path, "model", model) for model in json.loads(models))
+        self.db.executemany("INSERT INTO image_values VALUES (?, ?, ?)", values)
+
+    def _remove(self, paths: List[str]) -> None:
+        rows = [(path,) for path in paths]
+        self.db.executemany("DELETE FROM images WHERE path = ?", rows)
+        self.db.executemany("DELETE FROM image_values WHERE path = ?", rows)
+
+    def add(self, paths: List[str], prompt: Optional[Dict[str, Any]]) -> None:
+        """Index freshly saved files from the prompt they were saved with."""
+        fields = extract_fields(prompt)
+        rows = []
+        for path in paths:
+            try:
+                rows.append(_image_row(os.path.abspath(path), os.stat(path), fields))
+            except OSError:
+                continue
+        with self.db:
+            self._write_rows(rows)
+
+    def update(self, root: str, workers: Optional[int] = None) -> Dict[str, int]:
+        """Bring the index for PNGs under root up to date; returns file counts."""
+        root = os.path.abspath(root)
+        on_disk: Dict[str, Tuple[int, int]] = {}
+        for directory, _, files in os.walk(root):
+            for name in files:
+                if name.lower().endswith(".png"):
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    on_disk[path] = (stat.st_mtime_ns, stat.st_size)
+
+        prefix = os.path.join(root, "")
+        indexed = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.db.execute(
+                "SELECT path, mtime_ns, size FROM images WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+        }
+        changed = [path for path, key in on_disk.items() if indexed.get(path) != key]
+        removed = [path for path in indexed if path not in on_disk]
+
+        with self.db:
+            self._remove(removed)
+        if len(changed) < PARALLEL_MIN_FILES or workers == 1:
+            rows = map(_parse_file, changed)
+            self._write_parsed(rows)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self._write_parsed(pool.map(_parse_file, changed, chunksize=PARSE_CHUNKSIZE))
+        return {"files": len(on_disk), "parsed": len(changed), "removed": len(removed)}
+
+    def _write_parsed(self, rows: Iterable[Optional[tuple]]) -> None:
+        batch = []
+        for row in rows:
+            if row is not None:
+                batch.append(row)
+            if len(batch) >= COMMIT_EVERY:
+                with self.db:
+                    self._write_rows(batch)
+                batch = []
+        with self.db:
+            self._write_rows(batch)
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        seed: Optional[int] = None,
+        model: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Images matching every given filter (text is a substring of the prompt texts)."""
+        query = "SELECT path, text, seeds, models FROM images WHERE 1"
+        params: List[Any] = []
+        if text:
+            query += " AND text LIKE ?"
+            params.append(f"%{text}%")
+        for kind, value in (("seed", seed), ("model", model)):
+            if value is not None:
+                query += " AND path IN (SELECT path FROM image_values WHERE kind = ? AND value = ?)"
+                params.extend((kind, str(value)))
+        query += " ORDER BY path LIMIT ?"
+        params.append(limit)
+        return [
+            {"path": path, "text": text, "seeds": json.loads(seeds), "models": json.loads(models)}
+            for path, text, seeds, models in self.db.execute(query, params)
+        ]
+
+
+class SavedImageIndexer:
+    """Adds saved PNGs to the LUMI_INDEX index on a background thread."""
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._index: Optional[MetadataIndex] = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.index_path)
+
+    def add_saved(
+        self,
+        paths: List[str],
+        prompt: Optional[Dict[str, Any]],
+        wait: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Queue files for indexing; wait runs first on the index thread (e.g. a write flush)."""
+        if not self.index_path or not paths:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lumi-index")
+        self._executor.submit(self._add, paths, prompt, wait)
+
+    def _add(self, paths, prompt, wait) -> None:
+        try:
+            if wait is not None:
+                wait()
+            if self._index is None:
+                self._index = MetadataIndex(self.index_path)
+            self._index.add(paths, prompt)
+        except Exception as e:
+            logging.error(f"Lumi metadata index update failed: {e}")
+
+
+# Index updated by Lumi Save Image (disabled unless LUMI_INDEX is set)
+saved_image_indexer = SavedImageIndexer(os.environ.get("LUMI_INDEX", ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Index and search Lumi Save Image PNG metadata")
+    parser.add_argument("root", help="Output directory to index")
+    parser.add_argument(
+        "--index",
+        default=os.environ.get("LUMI_INDEX"),
+        help="Index database (default: $LUMI_INDEX or ROOT/lumi_index.sqlite)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes")
+    parser.add_argument("--no-update", action="store_true", help="Query without rescanning")
+    parser.add_argument("--search", help="Substring of the prompt texts")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--model")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    index = MetadataIndex(args.index or os.path.join(args.root, "lumi_index.sqlite"))
+    if not args.no_update:
+        counts = index.update(args.root, workers=args.workers)
+        print(f"{counts['files']} PNGs, {counts['parsed']} parsed, {counts['removed']} removed")
+    if args.search or args.seed is not None or args.model:
+        for match in index.search(args.search, args.seed, args.model, args.limit):
+            print(match["path"])
+
+
+if __name__ == "__main__":
+    main()
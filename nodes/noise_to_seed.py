@@ -1,5 +1,5 @@
 """
-Lumi Noise To Seed node - extracts seed from NOISE objects.
+Lumi Noise To Seed node - extracts seeds from NOISE objects.
 """
 
 from __future__ import annotations
@@ -7,8 +7,30 @@ from __future__ import annotations
 from typing import Any
 
 
+def _noise_seeds(noise: Any) -> list[Any] | None:
+    """Raw seed values of one NOISE object (several for batched noise), or None."""
+    if isinstance(noise, dict):
+        seeds = noise.get("seeds", noise.get("seed"))
+    else:
+        seeds = getattr(noise, "seeds", None)
+        if seeds is None:
+            seeds = getattr(noise, "seed", None)
+    if seeds is None:
+        return None
+    if hasattr(seeds, "tolist"):
+        # Tensors and arrays of per-item seeds
+        seeds = seeds.tolist()
+    return list(seeds) if isinstance(seeds, (list, tuple)) else [seeds]
+
+
 class LumiNoiseToSeed:
-    """Extracts the seed value from a NOISE object."""
+    """
+    Extracts the seed values from NOISE objects.
+
+    Accepts a list of NOISE inputs and batched NOISE objects carrying one seed
+    per item (a "seeds" list/tensor or a list-valued seed), and outputs one
+    seed per item.
+    """
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -17,31 +39,49 @@ class LumiNoiseToSeed:
                 "noise": (
                     "NOISE",
                     {
-                        "tooltip": "RandomNoise object to extract the seed from.",
+                        "tooltip": "RandomNoise object(s) to extract the seed from.",
                     },
                 ),
             }
         }
 
     CATEGORY = "Lumi/Utils"
-    DESCRIPTION = "Extracts the seed from a NOISE object for nodes expecting an INT seed."
+    DESCRIPTION = (
+        "Extracts the seed from a NOISE object for nodes expecting an INT seed. "
+        "Lists and batched NOISE give one seed per item."
+    )
 
+    INPUT_IS_LIST = True
     RETURN_TYPES = ("INT",)
     RETURN_NAMES = ("seed",)
+    OUTPUT_IS_LIST = (True,)
     FUNCTION = "extract_seed"
 
-    def extract_seed(self, noise: Any) -> tuple[int]:
-        seed = None
-
-        if isinstance(noise, dict):
-            seed = noise.get("seed")
-        elif hasattr(noise, "seed"):
-            seed = noise.seed
+    def extract_seed(self, noise: list[Any]) -> tuple[list[int]]:
+        seeds = []
+        missing = []
+        invalid = []
+        for index, item in enumerate(noise):
+            values = _noise_seeds(item)
+            if values is None:
+                missing.append(index)
+                continue
+            for value in values:
+                try:
+                    seeds.append(int(value))
+                except (TypeError, ValueError):
+                    invalid.append(index)
+                    break
 
-        if seed is None:
-            raise ValueError("NOISE input does not include a seed value.")
+        # Report every bad input at once rather than the first one
+        errors = []
+        if missing:
+            errors.append(f"NOISE input(s) {missing} do not include a seed value.")
+        if invalid:
+            errors.append(f"NOISE input(s) {invalid} have seed values that are not integers.")
+        if errors:
+            raise ValueError(" ".join(errors))
+        if not seeds:
+            raise ValueError("NOISE input(s) contain no seed values.")
 
-        try:
-            return (int(seed),)
-        except (TypeError, ValueError) as exc:
-            raise ValueError("NOISE seed value must be an integer.") from exc
+        return (seeds,)
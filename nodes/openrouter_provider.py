@@ -57,7 +57,16 @@ class LumiOpenRouterProvider:
                         "tooltip": "Top-p sampling parameter for response diversity",
                     },
                 ),
-            }
+            },
+            "optional": {
+                "cache_instructions": (
+                    "BOOLEAN",
+                    {
+                        "default": True,
+                        "tooltip": "Mark the instructions as a cacheable prompt prefix for providers that support prompt caching",
+                    },
+                ),
+            },
         }
 
     RETURN_TYPES = ("LLM_PROVIDER",)
@@ -72,7 +81,12 @@ class LumiOpenRouterProvider:
     )
 
     def create_provider(
-        self, env_key: str, model: str, max_tokens: int, top_p: float
+        self,
+        env_key: str,
+        model: str,
+        max_tokens: int,
+        top_p: float,
+        cache_instructions: bool = True,
     ) -> Tuple[Dict[str, Any]]:
         """Create OpenRouter provider configuration."""
 
@@ -98,6 +112,7 @@ class LumiOpenRouterProvider:
             "model_info": model_info,
             "max_tokens": max_tokens,
             "top_p": top_p,
+            "cache_instructions": cache_instructions,
             "env_key": env_key,  # Store for reference but don't expose the actual key
         }
 
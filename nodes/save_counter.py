@@ -0,0 +1,116 @@
+"""
+In-process filename counter cache for Lumi Save Image.
+
+folder_paths.get_save_image_path lists the whole output subfolder to find the
+next counter. The cache does that scan once per resolved output prefix, then
+hands out counters from memory. Prefixes whose files are still queued in the
+background writer are never evicted, so their counters cannot be handed out
+again from a fresh scan.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import folder_paths
+
+from .file_writer import background_writer
+
+# Resolved output prefixes remembered (least recently used are dropped)
+MAX_CACHED_PREFIXES = 256
+
+
+def resolve_prefix(filename_prefix: str, image_width: int, image_height: int) -> str:
+    """Replace the date and size tokens the same way ComfyUI's get_save_image_path does."""
+    if "%" not in filename_prefix:
+        return filename_prefix
+    now = time.localtime()
+    replacements = {
+        "%width%": str(image_width),
+        "%height%": str(image_height),
+        "%year%": str(now.tm_year),
+        "%month%": str(now.tm_mon).zfill(2),
+        "%day%": str(now.tm_mday).zfill(2),
+        "%hour%": str(now.tm_hour).zfill(2),
+        "%minute%": str(now.tm_min).zfill(2),
+        "%second%": str(now.tm_sec).zfill(2),
+    }
+    for token, value in replacements.items():
+        filename_prefix = filename_prefix.replace(token, value)
+    return filename_prefix
+
+
+class CounterCache:
+    """Thread-safe next-counter cache keyed by output directory and resolved prefix."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_PREFIXES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def reserve(
+        self,
+        filename_prefix: str,
+        output_dir: str,
+        image_width: int,
+        image_height: int,
+        count: int,
+        rescan: bool = False,
+    ) -> tuple[str, str, int, str]:
+        """
+        Reserve count consecutive counters for a prefix.
+
+        Returns (full_output_folder, filename, first_counter, subfolder) like
+        get_save_image_path. The folder is scanned only on first use or when
+        rescan is set (after the caller found a collision on disk).
+        """
+        resolved = resolve_prefix(filename_prefix, image_width, image_height)
+        if "%" in resolved.replace("%batch_num%", ""):
+            # Tokens this cache does not know about: let ComfyUI resolve them every time
+            folder, filename, counter, subfolder, _ = folder_paths.get_save_image_path(
+                filename_prefix, output_dir, image_width, image_height
+            )
+            return folder, filename, counter, subfolder
+
+        key = (output_dir, resolved)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or rescan:
+                folder, filename, counter, subfolder, _ = folder_paths.get_save_image_path(
+                    resolved, output_dir, image_width, image_height
+                )
+                if entry is not None:
+                    # Counters already handed out may not be on disk yet
+                    counter = max(counter, entry[2])
+                entry = [folder, filename, counter, subfolder]
+                self._entries[key] = entry
+                if len(self._entries) > self.max_entries:
+                    self._evict()
+            else:
+                self._entries.move_to_end(key)
+
+            folder, filename, counter, subfolder = entry
+            entry[2] = counter + count
+        return folder, filename, counter, subfolder
+
+    def _evict(self) -> None:
+        """Drop least recently used entries, keeping those with files still being written."""
+        # The newest entry is the one just reserved from
+        for key in list(self._entries)[:-1]:
+            if len(self._entries) <= self.max_entries:
+                break
+            folder, filename = self._entries[key][:2]
+            prefix = os.path.join(folder, filename.split("%batch_num%")[0])
+            if not background_writer.has_pending(prefix):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global counter cache instance
+counter_cache = CounterCache()
@@ -1,18 +1,171 @@
 """
-Lumi Save Image node - saves PNG with optional JPG fallback for large files.
+Lumi Save Image node - saves PNG (or WebP/AVIF/JPEG XL) with optional JPG fallback for large PNGs.
+
+numpy, torch and PIL are imported when the node runs, not at import.
 """
 
-import json
+from __future__ import annotations
+
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from typing import TYPE_CHECKING
 
 import folder_paths
-import numpy as np
-from PIL import Image
-from PIL.PngImagePlugin import PngInfo
+
+from .file_writer import FSYNC_POLICIES, background_writer, write_atomic
+from .image_formats import (
+    FORMAT_EXTENSIONS,
+    JPEG_MAX_SEGMENT,
+    encode_image,
+    encode_jpeg,
+    encode_png,
+    estimate_png_size,
+    get_output_formats,
+    inject_jpeg_exif,
+    inject_png_metadata,
+    pack_metadata,
+    serialize_metadata,
+    sniff_format,
+)
+from .manifest import manifest, prompt_seeds
+from .metadata_index import saved_image_indexer
+from .save_counter import counter_cache
+
+if TYPE_CHECKING:
+    import numpy as np
+    import torch
 
 # 4MB threshold for JPG fallback
 SIZE_THRESHOLD_BYTES = 4 * 1024 * 1024
 
+# What to write when the PNG exceeds the threshold
+OVERSIZE_FORMATS = ["png+jpg", "jpg"]
+
+# Safety margin applied to the sampled PNG size prediction before skipping the
+# full PNG encode in "jpg" mode
+ESTIMATE_MARGIN = 1.25
+
+# Counter ranges tried before giving up on finding free output filenames
+MAX_RESERVE_ATTEMPTS = 100
+
+# Shared pool for encoding and writing images. PIL releases the GIL while
+# compressing, so batch images encode in parallel across cores.
+ENCODE_WORKERS = min(8, os.cpu_count() or 1)
+_encode_pool = ThreadPoolExecutor(max_workers=ENCODE_WORKERS, thread_name_prefix="lumi-save")
+
+
+# Upper bound on float scratch memory used while converting a batch to uint8
+CONVERT_CHUNK_BYTES = 256 * 1024 * 1024
+
+
+# Preview encoding: lossy WebP, fast method
+PREVIEW_QUALITY = 80
+PREVIEW_EFFORT = 0
+
+
+class StageTimes:
+    """
+    Optional per-stage timing of save_images, used by the benchmarks.
+
+    Disabled by default. When enabled, seconds are summed per stage name
+    across the encode pool threads, so parallel stages can exceed wall time.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._totals: dict[str, float] = {}
+
+    @contextmanager
+    def __call__(self, stage: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._totals[stage] = self._totals.get(stage, 0.0) + elapsed
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._totals)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+# Global stage timer (enabled by benchmarks only)
+stage_times = StageTimes()
+
+
+def _lazy_exif(texts):
+    """
+    Return a thread-safe getter for the JPEG EXIF of serialized metadata.
+
+    The EXIF is packed on the first call only, so batches without a JPEG
+    output never build it.
+    """
+    lock = threading.Lock()
+    exif = []
+
+    def get():
+        with lock:
+            if not exif:
+                with stage_times("metadata"):
+                    exif.append(pack_metadata(texts, "jpg"))
+        return exif[0]
+
+    return get
+
+
+def _downsample(batch: np.ndarray, max_size: int) -> np.ndarray:
+    """
+    Box-filter a (B, H, W, C) uint8 batch by one integer factor for the whole
+    batch, so the long edge is at most max_size. The short edge of very
+    elongated images is kept at least 1 pixel.
+    """
+    import numpy as np
+
+    b, h, w, c = batch.shape
+    factor = -(-max(h, w) // max_size)
+    if factor <= 1:
+        return batch
+    fh, fw = min(factor, h), min(factor, w)
+    h2, w2 = max(1, h // fh), max(1, w // fw)
+    blocks = batch[:, : h2 * fh, : w2 * fw].reshape(b, h2, fh, w2, fw, c)
+    return blocks.mean(axis=(2, 4), dtype=np.float32).round().astype(np.uint8)
+
+
+def _to_uint8(images: torch.Tensor) -> np.ndarray:
+    """
+    Convert a (B, H, W, C) image batch in [0, 1] to a uint8 numpy array.
+
+    Scaling, rounding and clamping happen in place on float32 scratch chunks so
+    peak memory stays bounded. The result is assembled on the tensor's device
+    and copied to the host once, as uint8.
+    """
+    import torch
+
+    if images.dtype == torch.uint8:
+        return images.cpu().numpy()
+
+    out = torch.empty(images.shape, dtype=torch.uint8, device=images.device)
+    chunk = max(1, CONVERT_CHUNK_BYTES // max(1, images[0].numel() * 4))
+    for start in range(0, images.shape[0], chunk):
+        scratch = images[start : start + chunk].to(torch.float32).mul(255.0)
+        scratch.round_().clamp_(0, 255)
+        out[start : start + chunk].copy_(scratch)
+    return out.cpu().numpy()
+
 
 class LumiSaveImage:
     """
@@ -23,13 +176,11 @@ class LumiSaveImage:
     def __init__(self):
         self.output_dir = folder_paths.get_output_directory()
         self.type = "output"
-        self.compress_level = 4
 
     @classmethod
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "images": ("IMAGE",),
                 "directory": (
                     "STRING",
                     {
@@ -46,6 +197,14 @@ class LumiSaveImage:
                 ),
             },
             "optional": {
+                "images": ("IMAGE",),
+                "image_bytes": (
+                    "LUMI_IMAGE_BYTES",
+                    {
+                        "tooltip": "Encoded images (e.g. from Lumi LLM Imagen Processor) written "
+                        "as-is with the workflow added; used when images is not connected",
+                    },
+                ),
                 "jpg_quality": (
                     "INT",
                     {
@@ -56,6 +215,78 @@ class LumiSaveImage:
                         "tooltip": "JPEG quality (1-100) when PNG exceeds 4MB",
                     },
                 ),
+                "oversize_format": (
+                    OVERSIZE_FORMATS,
+                    {
+                        "default": "png+jpg",
+                        "tooltip": "When the PNG exceeds 4MB: keep the PNG and add a JPG, or write only the JPG",
+                    },
+                ),
+                "compress_metadata": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Store workflow metadata as compressed iTXt chunks (smaller files for large workflows). Frontends that only read uncompressed chunks cannot load the workflow from these images",
+                    },
+                ),
+                "format": (
+                    get_output_formats(),
+                    {
+                        "default": "png",
+                        "tooltip": "Output format. The JPG fallback only applies to PNG",
+                    },
+                ),
+                "quality": (
+                    "INT",
+                    {
+                        "default": 90,
+                        "min": 1,
+                        "max": 100,
+                        "step": 1,
+                        "tooltip": "Quality (1-100) for lossy WebP, AVIF and JPEG XL",
+                    },
+                ),
+                "effort": (
+                    "INT",
+                    {
+                        "default": 4,
+                        "min": 0,
+                        "max": 9,
+                        "step": 1,
+                        "tooltip": "Compression effort (0 = fastest, 9 = smallest). PNG compress level; mapped to WebP method, AVIF speed and JPEG XL effort",
+                    },
+                ),
+                "fsync": (
+                    FSYNC_POLICIES,
+                    {
+                        "default": "none",
+                        "tooltip": "Durability: fsync nothing, each file, or each file and its directory after the atomic rename",
+                    },
+                ),
+                "async_write": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Return once encoding is done and write files on a background thread (for slow or network storage)",
+                    },
+                ),
+                "preview": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Show small WebP previews in the UI instead of loading the full-size files",
+                    },
+                ),
+                "preview_size": (
+                    "INT",
+                    {
+                        "default": 512,
+                        "min": 64,
+                        "max": 2048,
+                        "step": 64,
+                        "tooltip": "Maximum long edge of the UI previews in pixels",
+                    },
+                ),
             },
             "hidden": {"prompt": "PROMPT", "extra_pnginfo": "EXTRA_PNGINFO"},
         }
@@ -64,14 +295,27 @@ class LumiSaveImage:
     FUNCTION = "save_images"
     OUTPUT_NODE = True
     CATEGORY = "Lumi/image"
-    DESCRIPTION = "Save images as PNG. If PNG > 4MB, also saves a JPG version."
+    DESCRIPTION = (
+        "Save images as PNG. If PNG > 4MB, also saves a JPG version (or only the JPG). "
+        "Encoded image bytes are written as-is with the workflow added."
+    )
 
     def save_images(
         self,
-        images,
+        images=None,
         directory="",
         filename="ComfyUI",
         jpg_quality=100,
+        oversize_format="png+jpg",
+        compress_metadata=False,
+        format="png",
+        quality=90,
+        effort=4,
+        fsync="none",
+        async_write=False,
+        preview=False,
+        preview_size=512,
+        image_bytes=None,
         prompt=None,
         extra_pnginfo=None,
     ):
@@ -81,58 +325,367 @@ class LumiSaveImage:
         else:
             full_prefix = filename
 
-        (
-            full_output_folder,
-            resolved_filename,
-            counter,
-            subfolder,
-            _,
-        ) = folder_paths.get_save_image_path(
-            full_prefix, self.output_dir, images[0].shape[1], images[0].shape[0]
+        if images is None:
+            if not image_bytes:
+                raise ValueError("Lumi Save Image needs images or image_bytes connected")
+            return self._save_encoded(
+                image_bytes,
+                full_prefix,
+                jpg_quality,
+                oversize_format,
+                compress_metadata,
+                effort,
+                fsync,
+                async_write,
+                preview,
+                preview_size,
+                prompt,
+                extra_pnginfo,
+            )
+
+        extensions = [FORMAT_EXTENSIONS[format]] + (["jpg"] if format == "png" else [])
+        full_output_folder, base_files, subfolder = self._reserve_files(
+            full_prefix, images[0].shape[1], images[0].shape[0], len(images), extensions
+        )
+
+        # Convert the whole batch to uint8 in one fused pass
+        with stage_times("convert"):
+            batch = _to_uint8(images)
+
+        # Serialize the workflow once for the whole batch
+        with stage_times("metadata"):
+            texts = serialize_metadata(prompt, extra_pnginfo)
+            metadata = pack_metadata(texts, format, compress_metadata)
+        # Oversized PNGs fall back to JPEG, which carries the workflow in EXIF
+        get_jpg_exif = _lazy_exif(texts)
+
+        jobs = []
+
+        for pixels, base_file in zip(batch, base_files, strict=True):
+            jobs.append(
+                _encode_pool.submit(
+                    self._save_image,
+                    pixels,
+                    full_output_folder,
+                    base_file,
+                    format,
+                    metadata,
+                    quality,
+                    effort,
+                    jpg_quality,
+                    get_jpg_exif,
+                    oversize_format,
+                    fsync,
+                    async_write,
+                )
+            )
+
+        # Previews are downsampled for the whole batch at once and encoded in
+        # the same pool; the UI then references them instead of the full files
+        preview_jobs = []
+        if preview:
+            preview_fmt = "webp" if "webp" in get_output_formats() else "png"
+            preview_folder = os.path.join(folder_paths.get_temp_directory(), subfolder)
+            os.makedirs(preview_folder, exist_ok=True)
+            for pixels, base_file in zip(_downsample(batch, preview_size), base_files, strict=True):
+                preview_jobs.append(
+                    _encode_pool.submit(
+                        self._save_preview, pixels, preview_folder, base_file, preview_fmt
+                    )
+                )
+
+        # Collect in batch order; re-raises the first encode/write error
+        filenames = [job.result() for job in jobs]
+        self._record_saved(filenames, full_output_folder, subfolder, prompt, async_write)
+        results = [
+            {"filename": filename, "subfolder": subfolder, "type": self.type}
+            for filename in filenames
+        ]
+        if preview_jobs:
+            results = [
+                {"filename": job.result(), "subfolder": subfolder, "type": "temp"}
+                for job in preview_jobs
+            ]
+
+        return {"ui": {"images": results}}
+
+    def _record_saved(self, filenames, folder, subfolder, prompt, async_write):
+        """Append the saved files to the job manifest and the metadata index."""
+        if manifest.enabled:
+            manifest.record(
+                "save_image",
+                files=[os.path.join(subfolder, filename) for filename in filenames],
+                seeds=prompt_seeds(prompt),
+            )
+        if saved_image_indexer.enabled:
+            saved_image_indexer.add_saved(
+                [os.path.join(folder, name) for name in filenames if name.endswith(".png")],
+                prompt,
+                wait=background_writer.flush if async_write else None,
+            )
+
+    def _reserve_files(self, full_prefix, width, height, count, extensions):
+        """
+        Reserve count output names, returning (folder, base_files, subfolder).
+
+        Counters come from the in-process cache. If one of the reserved names
+        already exists on disk or is still queued in the background writer, the
+        folder is rescanned once and the counter then keeps advancing until
+        every name is free, so an existing file is never replaced.
+        """
+        last_counter = None
+        for attempt in range(MAX_RESERVE_ATTEMPTS):
+            full_output_folder, resolved_filename, counter, subfolder = counter_cache.reserve(
+                full_prefix, self.output_dir, width, height, count, rescan=attempt == 1
+            )
+            if last_counter is not None:
+                # Prefixes the cache cannot resolve are rescanned on every call
+                counter = max(counter, last_counter + count)
+            last_counter = counter
+
+            base_files = []
+            for batch_number in range(count):
+                filename_with_batch = resolved_filename.replace("%batch_num%", str(batch_number))
+                base_files.append(f"{filename_with_batch}_{counter + batch_number:05}_")
+            paths = [
+                os.path.join(full_output_folder, f"{base_file}.{ext}")
+                for base_file in base_files
+                for ext in extensions
+            ]
+            if not any(
+                os.path.exists(path) or background_writer.is_pending(path) for path in paths
+            ):
+                # The cached folder may have been deleted since it was first scanned
+                os.makedirs(full_output_folder, exist_ok=True)
+                return full_output_folder, base_files, subfolder
+
+        raise FileExistsError(
+            f"No free output filenames for {full_prefix} after {MAX_RESERVE_ATTEMPTS} attempts"
         )
 
-        results = []
-
-        for batch_number, image in enumerate(images):
-            # Convert tensor to PIL Image
-            i = 255.0 * image.cpu().numpy()
-            img = Image.fromarray(np.clip(i, 0, 255).astype(np.uint8))
-
-            # Build metadata
-            metadata = None
-            try:
-                from comfy.cli_args import args
-
-                if not args.disable_metadata:
-                    metadata = PngInfo()
-                    if prompt is not None:
-                        metadata.add_text("prompt", json.dumps(prompt))
-                    if extra_pnginfo is not None:
-                        for x in extra_pnginfo:
-                            metadata.add_text(x, json.dumps(extra_pnginfo[x]))
-            except Exception:
-                # If we can't access args, just skip metadata
-                pass
-
-            # Generate filename
-            filename_with_batch = resolved_filename.replace("%batch_num%", str(batch_number))
-            png_file = f"{filename_with_batch}_{counter:05}_.png"
-            png_path = os.path.join(full_output_folder, png_file)
-
-            # Save PNG
-            img.save(png_path, pnginfo=metadata, compress_level=self.compress_level)
-
-            # Check file size and save JPG if needed
-            png_size = os.path.getsize(png_path)
-            if png_size > SIZE_THRESHOLD_BYTES:
-                jpg_file = f"{filename_with_batch}_{counter:05}_.jpg"
-                jpg_path = os.path.join(full_output_folder, jpg_file)
-                # Convert to RGB if needed (in case of RGBA)
-                if img.mode in ("RGBA", "P"):
-                    img = img.convert("RGB")
-                img.save(jpg_path, quality=jpg_quality, optimize=True)
-
-            results.append({"filename": png_file, "subfolder": subfolder, "type": self.type})
-            counter += 1
+    def _save_encoded(
+        self,
+        image_bytes,
+        full_prefix,
+        jpg_quality,
+        oversize_format,
+        compress_metadata,
+        effort,
+        fsync,
+        async_write,
+        preview,
+        preview_size,
+        prompt,
+        extra_pnginfo,
+    ):
+        """
+        Save already-encoded PNG/JPEG images verbatim with the workflow spliced in.
+
+        PNGs get text chunks and JPEGs an EXIF segment; images in other formats,
+        or JPEGs whose EXIF would not fit in one segment, are decoded and saved
+        through the normal PNG path instead.
+        """
+        from PIL import Image
+
+        width, height = Image.open(BytesIO(image_bytes[0]["data"])).size
+        full_output_folder, base_files, subfolder = self._reserve_files(
+            full_prefix, width, height, len(image_bytes), ["png", "jpg"]
+        )
+
+        with stage_times("metadata"):
+            texts = serialize_metadata(prompt, extra_pnginfo)
+            png_metadata = pack_metadata(texts, "png", compress_metadata)
+        get_exif = _lazy_exif(texts)
+
+        jobs = [
+            _encode_pool.submit(
+                self._save_encoded_image,
+                entry["data"],
+                full_output_folder,
+                base_file,
+                png_metadata,
+                get_exif,
+                effort,
+                jpg_quality,
+                oversize_format,
+                fsync,
+                async_write,
+            )
+            for entry, base_file in zip(image_bytes, base_files, strict=True)
+        ]
+
+        preview_jobs = []
+        if preview:
+            preview_fmt = "webp" if "webp" in get_output_formats() else "png"
+            preview_folder = os.path.join(folder_paths.get_temp_directory(), subfolder)
+            os.makedirs(preview_folder, exist_ok=True)
+            for entry, base_file in zip(image_bytes, base_files, strict=True):
+                preview_jobs.append(
+                    _encode_pool.submit(
+                        self._save_encoded_preview,
+                        entry["data"],
+                        preview_size,
+                        preview_folder,
+                        base_file,
+                        preview_fmt,
+                    )
+                )
+
+        filenames = [job.result() for job in jobs]
+        self._record_saved(filenames, full_output_folder, subfolder, prompt, async_write)
+        results = [
+            {"filename": filename, "subfolder": subfolder, "type": self.type}
+            for filename in filenames
+        ]
+        if preview_jobs:
+            results = [
+                {"filename": job.result(), "subfolder": subfolder, "type": "temp"}
+                for job in preview_jobs
+            ]
 
         return {"ui": {"images": results}}
+
+    def _save_encoded_image(
+        self,
+        data,
+        output_folder,
+        base_file,
+        png_metadata,
+        get_exif,
+        effort,
+        jpg_quality,
+        oversize_format,
+        fsync,
+        async_write,
+    ):
+        """Write one encoded image verbatim plus metadata (runs on the encode pool)."""
+        import numpy as np
+        from PIL import Image
+
+        fmt = sniff_format(data)
+        out = data
+        exif = get_exif() if fmt == "jpg" else None
+        if fmt == "png" and png_metadata is not None:
+            out = inject_png_metadata(data, png_metadata)
+        elif exif is not None:
+            out = inject_jpeg_exif(data, exif)
+
+        if fmt is None or out is None:
+            # Unknown format or the metadata cannot be spliced in: re-encode
+            with stage_times("convert"):
+                pixels = np.array(Image.open(BytesIO(data)).convert("RGB"))
+            return self._save_image(
+                pixels,
+                output_folder,
+                base_file,
+                "png",
+                png_metadata,
+                None,
+                effort,
+                jpg_quality,
+                get_exif,
+                oversize_format,
+                fsync,
+                async_write,
+            )
+
+        out_file = f"{base_file}.{fmt}"
+        path = os.path.join(output_folder, out_file)
+        with stage_times("write"):
+            if async_write:
+                background_writer.submit(path, out, fsync)
+            else:
+                write_atomic(path, out, fsync)
+        return out_file
+
+    def _save_encoded_preview(self, data, preview_size, preview_folder, base_file, fmt):
+        """Decode, downsample and write one UI preview for an encoded image."""
+        import numpy as np
+        from PIL import Image
+
+        pixels = np.array(Image.open(BytesIO(data)).convert("RGB"))
+        pixels = _downsample(pixels[np.newaxis], preview_size)[0]
+        return self._save_preview(pixels, preview_folder, base_file, fmt)
+
+    def _save_image(
+        self,
+        pixels,
+        output_folder,
+        base_file,
+        fmt,
+        metadata,
+        quality,
+        effort,
+        jpg_quality,
+        get_jpg_exif,
+        oversize_format,
+        fsync,
+        async_write,
+    ):
+        """
+        Encode and write one image (runs on the encode pool).
+
+        Output formats are decided from the in-memory encode (or a sampled PNG
+        size prediction in "jpg" mode) before anything touches disk. Returns
+        the filename to show in the UI.
+        """
+        from PIL import Image
+
+        img = Image.fromarray(pixels)
+
+        def write(file, data):
+            path = os.path.join(output_folder, file)
+            with stage_times("write"):
+                if async_write:
+                    background_writer.submit(path, data, fsync)
+                else:
+                    write_atomic(path, data, fsync)
+
+        if fmt != "png":
+            out_file = f"{base_file}.{FORMAT_EXTENSIONS[fmt]}"
+            with stage_times("encode"):
+                data = encode_image(img, fmt, metadata, quality, effort)
+            write(out_file, data)
+            return out_file
+
+        png_file = f"{base_file}.png"
+        jpg_file = f"{base_file}.jpg"
+
+        png_data = None
+        predicted = 0
+        if oversize_format == "jpg":
+            with stage_times("estimate"):
+                predicted = estimate_png_size(pixels, effort)
+        if predicted > SIZE_THRESHOLD_BYTES * ESTIMATE_MARGIN:
+            # Clearly oversized: skip the PNG encode entirely
+            oversized = True
+        else:
+            with stage_times("encode"):
+                png_data = encode_png(img, metadata, effort)
+            oversized = len(png_data) > SIZE_THRESHOLD_BYTES
+
+        write_png = not (oversized and oversize_format == "jpg")
+        if write_png:
+            write(png_file, png_data)
+
+        if oversized:
+            jpg_exif = get_jpg_exif()
+            if not write_png and jpg_exif is not None and len(jpg_exif) > JPEG_MAX_SEGMENT:
+                logging.warning(
+                    f"Lumi Save Image: workflow too large for JPEG EXIF, not stored in {jpg_file}"
+                )
+            with stage_times("jpeg_fallback"):
+                jpg_data = encode_jpeg(img, jpg_quality, jpg_exif)
+            write(jpg_file, jpg_data)
+
+        return png_file if write_png else jpg_file
+
+    def _save_preview(self, pixels, preview_folder, base_file, fmt):
+        """Encode and write one UI preview to the temp directory (runs on the encode pool)."""
+        from PIL import Image
+
+        preview_file = f"{base_file}.{FORMAT_EXTENSIONS[fmt]}"
+        with stage_times("preview"):
+            data = encode_image(Image.fromarray(pixels), fmt, None, PREVIEW_QUALITY, PREVIEW_EFFORT)
+            write_atomic(os.path.join(preview_folder, preview_file), data)
+        return preview_file
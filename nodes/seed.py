@@ -1,9 +1,13 @@
 """
-Lumi Seed node - outputs a random seed value.
+Lumi Seed nodes - output a seed value or a sweep of seeds.
 """
 
 from __future__ import annotations
 
+from .seeding import MASK64, api_seed_stream, fold_seed
+
+SWEEP_MODES = ["range", "hashed"]
+
 
 class LumiSeed:
     """
@@ -22,7 +26,7 @@ class LumiSeed:
                     {
                         "default": 0,
                         "min": 0,
-                        "max": 0xFFFFFFFF,
+                        "max": MASK64,
                         "tooltip": "The seed value to output.",
                         "control_after_generate": True,
                     },
@@ -39,3 +43,71 @@ class LumiSeed:
 
     def execute(self, seed: int) -> tuple[int]:
         return (seed,)
+
+
+class LumiSeedSweep:
+    """
+    Outputs a list of seeds, so one execution covers a whole seed sweep.
+
+    range gives seed, seed + stride, seed + 2 * stride, ...; hashed gives
+    well-mixed seeds derived from seed (a SplitMix64 stream), which never
+    repeat within a sweep. Every seed is folded below 2^31 with fold_seed, so
+    the imagen providers receive it unchanged rather than through the legacy
+    seed % (2^31 - 1) mapping, whose collisions sweeps would otherwise hit.
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "seed": (
+                    "INT",
+                    {
+                        "default": 0,
+                        "min": 0,
+                        "max": MASK64,
+                        "tooltip": "First seed of the range, or the base seed of hashed seeds. "
+                        "Output seeds are folded below 2^31, so seeds up to 2^31 - 2 are kept as is.",
+                        "control_after_generate": True,
+                    },
+                ),
+                "count": (
+                    "INT",
+                    {"default": 4, "min": 1, "max": 10000, "tooltip": "Number of seeds."},
+                ),
+                "stride": (
+                    "INT",
+                    {
+                        "default": 1,
+                        "min": 1,
+                        "max": 0xFFFFFFFF,
+                        "tooltip": "Step between seeds in range mode.",
+                    },
+                ),
+                "mode": (
+                    SWEEP_MODES,
+                    {
+                        "default": "range",
+                        "tooltip": "range: evenly spaced seeds. hashed: seeds derived by hashing.",
+                    },
+                ),
+            },
+        }
+
+    CATEGORY = "Lumi/Utils"
+    DESCRIPTION = (
+        "Outputs a list of seeds (a stepped range or hashed derivations of one seed). "
+        "Connected nodes run once per seed within a single queued prompt."
+    )
+
+    RETURN_TYPES = ("INT",)
+    RETURN_NAMES = ("seeds",)
+    OUTPUT_IS_LIST = (True,)
+    FUNCTION = "execute"
+
+    def execute(self, seed: int, count: int, stride: int, mode: str) -> tuple[list[int]]:
+        if mode == "hashed":
+            seeds = api_seed_stream(seed, count)
+        else:
+            seeds = [fold_seed(seed + i * stride) for i in range(count)]
+        return (seeds,)
@@ -0,0 +1,89 @@
+"""
+Shared seed derivation for Lumi nodes.
+
+Seeds are 64-bit (0 to 2^64 - 1) across all Lumi nodes:
+- seed_stream: well-mixed, never-repeating seeds from one base seed (SplitMix64)
+- fold_seed: fit a seed into a narrower API range (e.g. int32), keeping values
+  that already fit unchanged
+- image_api_seed: the int32 seed sent to the imagen providers
+- api_seed_stream: hashed seeds that reach the imagen APIs unchanged and distinct
+"""
+
+from __future__ import annotations
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# SplitMix64 state increment
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+# Seed widths accepted by the image APIs (int32) and chat completions (int64)
+IMAGE_API_SEED_BITS = 31
+CHAT_API_SEED_BITS = 63
+
+# Seeds up to this value keep the seed % (2^31 - 1) mapping the imagen
+# providers used before 64-bit seeds, so saved workflows give the same images
+LEGACY_IMAGE_SEED_MAX = 0xFFFFFFFF
+INT32_MAX = 0x7FFFFFFF
+
+
+def splitmix64(state: int) -> int:
+    """SplitMix64 output for a state; a bijection on 64-bit integers."""
+    z = state & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def seed_stream(seed: int, count: int) -> list[int]:
+    """count hashed seeds derived from seed; no value repeats for count <= 2^64."""
+    return [splitmix64(seed + (i + 1) * GOLDEN_GAMMA) for i in range(count)]
+
+
+def fold_seed(seed: int, bits: int = IMAGE_API_SEED_BITS) -> int:
+    """
+    Fold a 64-bit seed into [0, 2^bits) by XOR-ing its bits-wide pieces.
+
+    Seeds below 2^bits are returned unchanged, and seeds that differ only in
+    their low bits stay distinct, so consecutive seeds within an aligned block
+    of 2^bits never collide. The high bits still change the result, where
+    seed % (2^31 - 1) maps 0, 2^31 - 1, 2^32 - 2, ... all to 0.
+    """
+    seed &= MASK64
+    mask = (1 << bits) - 1
+    folded = 0
+    while seed:
+        folded ^= seed & mask
+        seed >>= bits
+    return folded
+
+
+def image_api_seed(seed: int) -> int:
+    """
+    int32 seed for the imagen APIs.
+
+    Seeds up to 2^32 - 1 map as before (seed % (2^31 - 1)); larger seeds are
+    folded with fold_seed, so they no longer match what older versions sent.
+    """
+    if 0 <= seed <= LEGACY_IMAGE_SEED_MAX:
+        return seed % INT32_MAX
+    return fold_seed(seed)
+
+
+def api_seed_stream(seed: int, count: int) -> list[int]:
+    """
+    count distinct hashed seeds derived from seed, folded below 2^31 - 1.
+
+    image_api_seed sends these unchanged, so each one is a different API seed.
+    Values that would repeat after folding are skipped, as is 2^31 - 1, which
+    is sent as 0.
+    """
+    seeds: list[int] = []
+    seen: set[int] = set()
+    state = seed
+    while len(seeds) < count:
+        state += GOLDEN_GAMMA
+        value = fold_seed(splitmix64(state))
+        if value != INT32_MAX and value not in seen:
+            seen.add(value)
+            seeds.append(value)
+    return seeds
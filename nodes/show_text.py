@@ -4,12 +4,10 @@ Lumi Show Text node - displays text output in the node.
 
 from __future__ import annotations
 
-try:
-    from server import PromptServer
+from .feedback import send_widget_value
+from .text_pages import text_pages
 
-    HAS_SERVER = True
-except ImportError:
-    HAS_SERVER = False
+DISPLAY_MODES = ["all", "first", "last"]
 
 
 class LumiShowText:
@@ -26,12 +24,32 @@ class LumiShowText:
             },
             "optional": {
                 "displayed_text": ("STRING", {"multiline": True, "default": ""}),
+                "display_mode": (
+                    DISPLAY_MODES,
+                    {
+                        "default": "all",
+                        "tooltip": "all: show every item. first/last: show only the first or "
+                        "last display_items items; other pages are fetched on demand",
+                    },
+                ),
+                "display_items": (
+                    "INT",
+                    {
+                        "default": 100,
+                        "min": 1,
+                        "max": 1000,
+                        "tooltip": "Items per page in first/last mode",
+                    },
+                ),
             },
             "hidden": {"unique_id": "UNIQUE_ID"},
         }
 
     CATEGORY = "Lumi/Utils"
-    DESCRIPTION = "Displays text output. Connect to any STRING output to view its contents."
+    DESCRIPTION = (
+        "Displays text output. Connect to any STRING output to view its contents. "
+        "For long lists, first/last mode shows one page at a time."
+    )
 
     INPUT_IS_LIST = True
     RETURN_TYPES = ("STRING",)
@@ -40,17 +58,25 @@ class LumiShowText:
     OUTPUT_NODE = True
     FUNCTION = "show"
 
-    def show(self, text, unique_id=None, **kwargs):
-        display_text = "\n".join(text)
-
-        if HAS_SERVER and unique_id is not None:
-            PromptServer.instance.send_sync(
-                "lumi-node-feedback",
-                {
-                    "node_id": unique_id,
-                    "widget_name": "displayed_text",
-                    "value": display_text,
-                },
-            )
+    def show(self, text, unique_id=None, display_mode=None, display_items=None, **kwargs):
+        # INPUT_IS_LIST wraps every input in a list
+        mode = display_mode[0] if display_mode else "all"
+        if isinstance(unique_id, list):
+            unique_id = unique_id[0] if unique_id else None
+
+        if unique_id is not None:
+            text_pages.store(unique_id, text)
+            if mode == "all":
+                send_widget_value(unique_id, "displayed_text", "\n".join(text), preview=True)
+            else:
+                limit = display_items[0] if display_items else 100
+                offset = 0 if mode == "first" else max(len(text) - limit, 0)
+                send_widget_value(
+                    unique_id,
+                    "displayed_text",
+                    "\n".join(text[offset : offset + limit]),
+                    preview=True,
+                    page={"offset": offset, "limit": limit, "total": len(text)},
+                )
 
         return (text,)
@@ -1,5 +1,5 @@
 """
-Lumi Shuffle Prompt node - shuffles tokens in a prompt.
+Lumi Shuffle Prompt nodes - shuffle tokens in a prompt, one seed or many.
 """
 
 from __future__ import annotations
@@ -7,6 +7,12 @@ from __future__ import annotations
 import random
 
 
+def _tokenize(text: str) -> list[str]:
+    """Strip newlines and commas and split on spaces."""
+    text = text.replace("\n", " ").replace("\r", " ").replace(",", "")
+    return [t for t in text.split(" ") if t]
+
+
 class LumiShufflePrompt:
     """
     Shuffles tokens in a prompt string.
@@ -42,9 +48,77 @@ class LumiShufflePrompt:
     FUNCTION = "shuffle"
 
     def shuffle(self, text: str, seed: int) -> tuple[str]:
-        text = text.replace("\n", " ").replace("\r", " ").replace(",", "")
-        tokens = [t for t in text.split(" ") if t]
+        tokens = _tokenize(text)
         rng = random.Random(seed)
         rng.shuffle(tokens)
         result = " ".join(tokens)
         return (result,)
+
+
+class LumiShufflePromptList:
+    """
+    Shuffles tokens for many texts and seeds at once.
+
+    Output k of text t with seed s is identical to LumiShufflePrompt(t, s).
+    Each text is tokenized once and the permutations for all seeds are
+    generated together.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "text": (
+                    "STRING",
+                    {"multiline": True, "tooltip": "The prompt text(s) to shuffle."},
+                ),
+                "seed": (
+                    "INT",
+                    {
+                        "default": 0,
+                        "min": 0,
+                        "max": 0xFFFFFFFFFFFFFFFF,
+                        "tooltip": "First seed of the range (a list of seeds starts one range each).",
+                    },
+                ),
+                "count": (
+                    "INT",
+                    {
+                        "default": 1,
+                        "min": 1,
+                        "max": 100000,
+                        "tooltip": "Number of consecutive seeds per starting seed.",
+                    },
+                ),
+            },
+        }
+
+    CATEGORY = "Lumi/Prompt"
+    DESCRIPTION = (
+        "Shuffles tokens like Lumi Shuffle Prompt for every text and every seed in "
+        "seed..seed+count-1, outputting one string per text and seed."
+    )
+
+    INPUT_IS_LIST = True
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("shuffled text",)
+    OUTPUT_IS_LIST = (True,)
+    FUNCTION = "shuffle"
+
+    def shuffle(self, text: list[str], seed: list[int], count: list[int]) -> tuple[list[str]]:
+        import numpy as np
+
+        from .batch_shuffle import shuffle_permutations
+
+        seeds = [start + i for start in seed for i in range(count[0])]
+
+        # Permutations depend only on the seed and the token count
+        perms_by_length: dict[int, np.ndarray] = {}
+        results = []
+        for item in text:
+            tokens = np.array(_tokenize(item), dtype=object)
+            perms = perms_by_length.get(len(tokens))
+            if perms is None:
+                perms = perms_by_length[len(tokens)] = shuffle_permutations(seeds, len(tokens))
+            results.extend(" ".join(row) for row in tokens[perms])
+        return (results,)
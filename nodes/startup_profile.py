@@ -0,0 +1,147 @@
+"""
+Startup profiler for the Lumi node pack.
+
+Enabled with LUMI_PROFILE_STARTUP=1. Records wall time of the package import
+phases, each node module import and each node's INPUT_TYPES (which ComfyUI
+calls for /object_info; the OpenRouter model list fetch and the wildcard scan
+happen there). A summary is logged once the package is registered and again
+once every node's INPUT_TYPES has run, and is served by the ComfyUI server:
+- GET /lumi/startup_profile   JSON summary ({"enabled": false} when off)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+try:
+    from server import PromptServer
+
+    HAS_SERVER = True
+except ImportError:
+    HAS_SERVER = False
+
+if HAS_SERVER:
+    from aiohttp import web
+
+
+class StartupProfile:
+    """Wall-time totals per (kind, name), with call counts and the first call's time."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._entries: Dict[tuple, Dict[str, Any]] = {}
+        self._pending_input_types: set = set()
+
+    @contextmanager
+    def phase(self, name: str, kind: str = "phase") -> Iterator[None]:
+        """Time a block under (kind, name); does nothing when disabled."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, start, time.perf_counter() - start)
+
+    def mark(self, name: str, kind: str = "phase") -> None:
+        """Record the time from this module's import (the start of the package import) to now."""
+        if self.enabled:
+            self.record(kind, name, self._origin, time.perf_counter() - self._origin)
+
+    def record(self, kind: str, name: str, start: float, seconds: float) -> None:
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is None:
+                entry = self._entries[(kind, name)] = {
+                    "kind": kind,
+                    "name": name,
+                    "at": start - self._origin,
+                    "first": seconds,
+                    "calls": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                }
+            entry["calls"] += 1
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+
+    def expect_nodes(self, node_names) -> None:
+        """Nodes whose first INPUT_TYPES call completes the startup summary."""
+        if self.enabled:
+            with self._lock:
+                self._pending_input_types.update(node_names)
+
+    def wrap_input_types(self, node_name: str, node_class: type) -> None:
+        """Time every INPUT_TYPES call of a node class (classes are wrapped once)."""
+        if not self.enabled:
+            return
+        current = getattr(node_class.__dict__.get("INPUT_TYPES"), "__func__", None)
+        if getattr(current, "lumi_profiled", False):
+            return
+        original = node_class.INPUT_TYPES
+
+        def timed_input_types(cls):
+            start = time.perf_counter()
+            try:
+                return original()
+            finally:
+                self.record("input_types", node_name, start, time.perf_counter() - start)
+                self._input_types_done(node_name)
+
+        timed_input_types.lumi_profiled = True
+        node_class.INPUT_TYPES = classmethod(timed_input_types)
+
+    def _input_types_done(self, node_name: str) -> None:
+        with self._lock:
+            if node_name not in self._pending_input_types:
+                return
+            self._pending_input_types.discard(node_name)
+            all_done = not self._pending_input_types
+        if all_done:
+            self.log_summary("after first INPUT_TYPES of every node")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable summary, slowest entries first."""
+        with self._lock:
+            entries: List[Dict[str, Any]] = [dict(entry) for entry in self._entries.values()]
+        entries.sort(key=lambda entry: -entry["total"])
+        totals: Dict[str, float] = {}
+        for entry in entries:
+            totals[entry["kind"]] = totals.get(entry["kind"], 0.0) + entry["total"]
+        return {"enabled": self.enabled, "totals": totals, "entries": entries}
+
+    def log_summary(self, label: str) -> None:
+        if not self.enabled:
+            return
+        snapshot = self.snapshot()
+        lines = [f"Lumi startup profile ({label}):"]
+        for kind, total in snapshot["totals"].items():
+            lines.append(f"  {kind}: {total * 1000:.1f} ms")
+        for entry in snapshot["entries"]:
+            lines.append(
+                f"  {entry['total'] * 1000:8.1f} ms  {entry['kind']:<12} {entry['name']}"
+                f" ({entry['calls']} call{'s' if entry['calls'] != 1 else ''},"
+                f" first {entry['first'] * 1000:.1f} ms)"
+            )
+        logging.info("\n".join(lines))
+
+
+# Global startup profile instance
+startup_profile = StartupProfile(
+    os.environ.get("LUMI_PROFILE_STARTUP", "").lower() in ("1", "true", "yes")
+)
+
+
+if HAS_SERVER:
+
+    @PromptServer.instance.routes.get("/lumi/startup_profile")
+    async def get_startup_profile(request):
+        return web.json_response(startup_profile.snapshot())
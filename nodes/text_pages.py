@@ -0,0 +1,93 @@
+"""
+Bounded text item buffers for paging through Lumi Show Text output.
+
+Each Show Text node keeps the last LUMI_SHOW_TEXT_MAX_ITEMS items (default
+10000) of its most recent run, so the UI can fetch pages of large lists on
+demand instead of receiving the whole list. Exposed through the ComfyUI server:
+- GET /lumi/show_text?node_id=...&offset=...&limit=...   items of one page
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    from server import PromptServer
+
+    HAS_SERVER = True
+except ImportError:
+    HAS_SERVER = False
+
+if HAS_SERVER:
+    from aiohttp import web
+
+# Largest page the route returns
+MAX_PAGE_ITEMS = 1000
+
+# Show Text nodes remembered (least recently updated are dropped)
+MAX_TRACKED_NODES = 64
+
+
+class TextPages:
+    """Per-node buffers holding the tail of each node's last item list."""
+
+    def __init__(self, max_items: int, max_nodes: int = MAX_TRACKED_NODES):
+        self.max_items = max_items
+        self.max_nodes = max_nodes
+        self._lock = threading.Lock()
+        # node_id -> (total item count, items[total - len(items):])
+        self._buffers: OrderedDict = OrderedDict()
+
+    def store(self, node_id: Any, items: List[str]) -> None:
+        """Replace a node's buffer with the last max_items of items."""
+        tail = items[-self.max_items :] if self.max_items > 0 else []
+        with self._lock:
+            self._buffers[str(node_id)] = (len(items), tail)
+            self._buffers.move_to_end(str(node_id))
+            while len(self._buffers) > self.max_nodes:
+                self._buffers.popitem(last=False)
+
+    def page(self, node_id: str, offset: int, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Items [offset, offset + limit) of a node's last run.
+
+        Items older than the buffer are no longer available; the offset is
+        clamped to the buffered range, which the result reports as "first".
+        """
+        with self._lock:
+            buffer = self._buffers.get(node_id)
+        if buffer is None:
+            return None
+        total, tail = buffer
+        first = total - len(tail)
+        limit = max(1, min(limit, MAX_PAGE_ITEMS))
+        offset = min(max(offset, first), max(total - limit, first))
+        items = tail[offset - first : offset - first + limit]
+        return {"total": total, "first": first, "offset": offset, "items": items}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# Global text page buffers
+text_pages = TextPages(_env_int("LUMI_SHOW_TEXT_MAX_ITEMS", 10000))
+
+
+if HAS_SERVER:
+
+    @PromptServer.instance.routes.get("/lumi/show_text")
+    async def get_show_text_page(request):
+        try:
+            offset = int(request.query.get("offset", 0))
+            limit = int(request.query.get("limit", 100))
+        except ValueError:
+            return web.json_response({"error": "offset and limit must be integers"}, status=400)
+        page = text_pages.page(request.query.get("node_id", ""), offset, limit)
+        if page is None:
+            return web.json_response({"error": "no text for this node"}, status=404)
+        return web.json_response(page)
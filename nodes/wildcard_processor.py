@@ -6,15 +6,9 @@ Based on ComfyUI-Impact-Pack's Wildcard Processor node.
 
 from __future__ import annotations
 
+from .feedback import send_widget_value
 from .wildcards import get_wildcard_list, process_wildcards
 
-try:
-    from server import PromptServer
-
-    HAS_SERVER = True
-except ImportError:
-    HAS_SERVER = False
-
 
 class LumiWildcardProcessor:
 
@@ -53,7 +47,7 @@ class LumiWildcardProcessor:
                         "default": 0,
                         "min": 0,
                         "max": 0xFFFFFFFFFFFFFFFF,
-                        "tooltip": "Random seed for wildcard processing.",
+                        "tooltip": "Random seed for wildcard processing. 0 gives a different random expansion each run.",
                     },
                 ),
                 "Select to add Wildcard": (get_wildcard_list(),),
@@ -89,14 +83,6 @@ class LumiWildcardProcessor:
             result = process_wildcards(text=kwargs["populated_text"], seed=seed)
 
         # Send feedback to update the populated_text widget in the UI
-        if HAS_SERVER and unique_id is not None:
-            PromptServer.instance.send_sync(
-                "lumi-node-feedback",
-                {
-                    "node_id": unique_id,
-                    "widget_name": "populated_text",
-                    "value": result,
-                },
-            )
+        send_widget_value(unique_id, "populated_text", result)
 
         return (result,)
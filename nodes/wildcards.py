@@ -1,25 +1,38 @@
 """
 Shared wildcard utilities for Lumi Pack nodes.
+
+dynamicprompts is imported and the wildcards folder type registered on first use.
 """
 
 from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .manifest import manifest
+from .startup_profile import startup_profile
 
-from dynamicprompts.enums import SamplingMethod
-from dynamicprompts.sampling_context import SamplingContext
-from dynamicprompts.wildcards import WildcardManager
+if TYPE_CHECKING:
+    from dynamicprompts.wildcards import WildcardManager
 
 # Cache for WildcardManager with mtime-based invalidation
 _wildcard_cache: dict = {"manager": None, "mtimes": {}}
 
+# Whether the 'wildcards' folder type has been registered with folder_paths
+_folder_paths_initialized = False
+
 
 def _init_wildcard_folder_paths() -> None:
     """
     Register 'wildcards' as a folder type in ComfyUI's folder_paths.
     This allows users to add custom wildcard paths via extra_model_paths.yaml
     """
+    global _folder_paths_initialized
+    if _folder_paths_initialized:
+        return
+    _folder_paths_initialized = True
+
     try:
         import folder_paths
 
@@ -56,6 +69,7 @@ def get_wildcard_paths() -> list[Path]:
         my_wildcards:
             wildcards: /home/user/my/wildcards/folder
     """
+    _init_wildcard_folder_paths()
     paths: list[Path] = []
 
     # Check environment variable
@@ -92,10 +106,6 @@ def get_wildcard_paths() -> list[Path]:
     return paths
 
 
-# Initialize folder paths on module load
-_init_wildcard_folder_paths()
-
-
 def _get_folder_mtimes(paths: list[Path]) -> dict[Path, float]:
     """
     Get modification times for wildcard folders and their contents.
@@ -123,6 +133,8 @@ def get_wildcard_manager() -> WildcardManager:
 
     Supports multiple wildcard directories via ComfyUI's folder_paths system.
     """
+    from dynamicprompts.wildcards import WildcardManager
+
     paths = get_wildcard_paths()
     current_mtimes = _get_folder_mtimes(paths)
 
@@ -147,8 +159,9 @@ def get_wildcard_manager() -> WildcardManager:
 def get_wildcard_list() -> list[str]:
     """Get a sorted list of available wildcards formatted for the dropdown."""
     try:
-        wm = get_wildcard_manager()
-        names = sorted(wm.get_collection_names())
+        with startup_profile.phase("wildcard scan", kind="io"):
+            wm = get_wildcard_manager()
+            names = sorted(wm.get_collection_names())
         # Format as __wildcard__ for easy copy-paste
         return ["Select the Wildcard to add to the text"] + [f"__{name}__" for name in names]
     except Exception:
@@ -166,12 +179,18 @@ def process_wildcards(text: str, seed: int) -> str:
     Returns:
         The processed text with wildcards resolved
     """
+    from dynamicprompts.enums import SamplingMethod
+    from dynamicprompts.sampling_context import SamplingContext
+
     context = SamplingContext(
         wildcard_manager=get_wildcard_manager(),
         default_sampling_method=SamplingMethod.RANDOM,
     )
+    # Seed 0 leaves the expansion random, as it always has
     if seed > 0:
         context.rand.seed(seed)
 
     prompts = list(context.sample_prompts(text, 1))
-    return str(prompts[0]) if prompts else text
+    result = str(prompts[0]) if prompts else text
+    manifest.record("wildcards", template=text, seed=seed, text=result)
+    return result
@@ -0,0 +1,59 @@
+"""Tests for Lumi Save Image output naming, run outside ComfyUI with stub modules."""
+
+import os
+import shutil
+import unittest
+
+from benchmarks.common import (
+    install_comfy_args_stub,
+    install_folder_paths_stub,
+    load_package,
+)
+
+
+def setUpModule():
+    global folder_paths, save_image
+    folder_paths = install_folder_paths_stub()
+    install_comfy_args_stub()
+    save_image = load_package().nodes.save_image
+
+
+def tearDownModule():
+    shutil.rmtree(folder_paths.base_path, ignore_errors=True)
+
+
+class SaveImageFolderTest(unittest.TestCase):
+    def setUp(self):
+        import torch
+
+        self.images = torch.rand(1, 8, 8, 3)
+        self.node = save_image.LumiSaveImage()
+        self.folder = os.path.join(folder_paths.get_output_directory(), "deleted_folder")
+
+    def save(self):
+        result = self.node.save_images(self.images, directory="deleted_folder", filename="x")
+        return result["ui"]["images"][0]["filename"]
+
+    def test_save_recreates_deleted_folder(self):
+        first = self.save()
+        shutil.rmtree(self.folder)
+
+        second = self.save()
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, second)))
+
+    def test_existing_names_are_skipped(self):
+        first = self.save()
+        # A file the counter cache does not know about takes the next name
+        taken = f"x_{int(first.split('_')[1]) + 1:05}_.jpg"
+        open(os.path.join(self.folder, taken), "wb").close()
+
+        second = self.save()
+
+        self.assertNotEqual(second.split(".")[0], taken.split(".")[0])
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, taken)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Tests for the seed mappings sent to the imagen APIs and Lumi Seed Sweep's seeds."""
+
+import unittest
+
+from benchmarks.common import load_package
+
+INT32_MAX = 2**31 - 1
+
+
+def setUpModule():
+    global seeding, seed_nodes
+    nodes = load_package().nodes
+    seeding = nodes.seeding
+    seed_nodes = nodes.seed
+
+
+class ImageApiSeedTest(unittest.TestCase):
+    def test_legacy_range_keeps_modulo_mapping(self):
+        for seed in (0, 1, 12345, INT32_MAX - 1, INT32_MAX, 2**31, 3_000_000_000, 2**32 - 1):
+            self.assertEqual(seeding.image_api_seed(seed), seed % INT32_MAX)
+
+    def test_legacy_range_known_collisions(self):
+        # Saved workflows rely on these mapping as they always have
+        for seed in (INT32_MAX, 2 * INT32_MAX):
+            self.assertEqual(seeding.image_api_seed(seed), seeding.image_api_seed(0))
+        # Folded large seeds can land on legacy values
+        self.assertEqual(seeding.image_api_seed(2**32), seeding.image_api_seed(2))
+
+    def test_large_seeds_are_folded(self):
+        for seed in (2**32, 2**40 + 7, 2**64 - 1):
+            self.assertEqual(seeding.image_api_seed(seed), seeding.fold_seed(seed))
+        self.assertEqual(seeding.fold_seed(2**40 + 3), seeding.fold_seed(2**40 + 2) ^ 1)
+
+
+class SeedSweepTest(unittest.TestCase):
+    def sweep(self, seed, count, stride=1, mode="range"):
+        return seed_nodes.LumiSeedSweep().execute(seed, count, stride, mode)[0]
+
+    def test_range_keeps_small_seeds(self):
+        self.assertEqual(self.sweep(10, 4, stride=3), [10, 13, 16, 19])
+
+    def test_range_folds_large_seeds(self):
+        seeds = self.sweep(2**40, 4)
+        self.assertEqual(seeds, [seeding.fold_seed(2**40 + i) for i in range(4)])
+        self.assertEqual(len(set(seeds)), 4)
+
+    def test_hashed_seeds_are_distinct_api_seeds(self):
+        for base in (0, 2**31 - 1, 2**64 - 1):
+            seeds = self.sweep(base, 2000, mode="hashed")
+            api_seeds = [seeding.image_api_seed(seed) for seed in seeds]
+            self.assertEqual(api_seeds, seeds)
+            self.assertEqual(len(set(seeds)), len(seeds))
+
+    def test_hashed_seeds_are_reproducible(self):
+        self.assertEqual(self.sweep(42, 8, mode="hashed"), self.sweep(42, 8, mode="hashed"))
+        self.assertEqual(self.sweep(42, 4, mode="hashed"), self.sweep(42, 8, mode="hashed")[:4])
+
+
+if __name__ == "__main__":
+    unittest.main()
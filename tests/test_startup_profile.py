@@ -0,0 +1,57 @@
+"""Tests for the startup profiler's node import and INPUT_TYPES accounting."""
+
+import importlib
+import sys
+import unittest
+
+from benchmarks.common import (
+    install_comfy_args_stub,
+    install_folder_paths_stub,
+    load_package,
+)
+
+
+def setUpModule():
+    global nodes, startup_profile_module, text_input_class
+    install_folder_paths_stub()
+    install_comfy_args_stub()
+    nodes = load_package().nodes
+    startup_profile_module = sys.modules[f"{nodes.__name__}.startup_profile"]
+    text_input_class = importlib.import_module(f"{nodes.__name__}.text_input").LumiTextInput
+
+
+class LazyNodeProfileTest(unittest.TestCase):
+    def setUp(self):
+        self.saved_profile = nodes.startup_profile
+        self.profile = startup_profile_module.StartupProfile(True)
+        nodes.startup_profile = self.profile
+        self.saved_input_types = text_input_class.__dict__["INPUT_TYPES"]
+        nodes.__dict__.pop("LumiTextInput", None)
+
+    def tearDown(self):
+        nodes.startup_profile = self.saved_profile
+        text_input_class.INPUT_TYPES = self.saved_input_types
+
+    def calls(self, kind):
+        entries = self.profile.snapshot()["entries"]
+        return [entry["calls"] for entry in entries if entry["kind"] == kind]
+
+    def test_repeated_lookups_profile_once(self):
+        mapping = nodes.LazyNodeMapping(["LumiTextInput"])
+        for _ in range(3):
+            node_class = mapping["LumiTextInput"]
+        node_class.INPUT_TYPES()
+
+        self.assertEqual(self.calls("import"), [1])
+        self.assertEqual(self.calls("input_types"), [1])
+
+    def test_wrap_input_types_is_idempotent(self):
+        node_class = nodes.LazyNodeMapping(["LumiTextInput"])["LumiTextInput"]
+        self.profile.wrap_input_types("LumiTextInput", node_class)
+        node_class.INPUT_TYPES()
+
+        self.assertEqual(self.calls("input_types"), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()